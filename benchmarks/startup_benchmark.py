@@ -0,0 +1,360 @@
+# benchmarks/startup_benchmark.py
+"""
+Startup benchmark for the API worker (main.app) and the dashboard.
+
+Measures:
+1. Cold import time per module (config, models.*, services.*, content.*,
+   main, dashboard), each in a fresh interpreter via `python -X importtime`.
+2. Service construction (registry, QlooService, GeminiService, TrendAnalyzer).
+3. Lifespan startup and the first (and a warm second) POST /api/analyze,
+   served in-process against stub Qloo/Gemini backends - no network or keys.
+
+Prints a breakdown, diffs it against a saved baseline when one exists and
+can save the current run as the new baseline:
+
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --save-baseline
+    python benchmarks/startup_benchmark.py --baseline other.json --fail-on-regression
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import pkgutil
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "startup_baseline.json")
+
+# Dummy keys so config.py takes the normal path; nothing here talks to the real APIs
+BENCH_ENV = {
+    "QLOO_API_KEY": "benchmark-qloo-key",
+    "GEMINI_API_KEY": "benchmark-gemini-key-0000000000",
+    "QLOO_RESPONSE_STORE_PATH": ""
+}
+
+SAMPLE_PREFERENCES = {
+    "music_genres": ["indie rock", "electronic"],
+    "dining_preferences": ["plant-based", "artisanal coffee"],
+    "fashion_styles": ["minimalist", "sustainable"],
+    "entertainment_types": ["documentaries", "podcasts"],
+    "lifestyle_choices": ["sustainable living", "wellness", "remote work"]
+}
+
+STUB_PREDICTIONS = {
+    "predictions": [
+        {
+            "product_category": "Sustainable Tech",
+            "predicted_trend": "Repairable modular audio gear",
+            "confidence_score": 84,
+            "timeline_days": 90,
+            "target_audience": ["eco-conscious creatives"],
+            "cultural_reasoning": "Benchmark stub response",
+            "market_opportunity": "Benchmark stub response"
+        }
+    ]
+}
+
+
+def discover_modules() -> List[str]:
+    """Modules whose cold import time is tracked, in dependency-ish order."""
+
+    modules = ["config"]
+    for package in ("models", "services", "content"):
+        path = os.path.join(ROOT, package)
+        modules += sorted(f"{package}.{info.name}" for info in pkgutil.iter_modules([path]))
+    return modules + ["main", "dashboard"]
+
+
+def measure_import(module: str, repeat: int) -> Dict:
+    """Median cold import time of `module` (cumulative, ms) from fresh interpreters."""
+
+    pythonpath = os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, **BENCH_ENV, "PYTHONPATH": pythonpath}
+    samples = []
+    heaviest: List = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, env=env, capture_output=True, text=True
+        )
+        timings = parse_importtime(proc.stderr)
+        if proc.returncode != 0 or module not in timings:
+            last_line = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+            return {"ok": False, "error": last_line[:200]}
+        samples.append(timings[module]["cumulative_us"] / 1000)
+        heaviest = sorted(timings.items(), key=lambda item: item[1]["self_us"], reverse=True)[:5]
+
+    return {
+        "ok": True,
+        "ms": round(statistics.median(samples), 2),
+        "heaviest_self_ms": {name: round(t["self_us"] / 1000, 2) for name, t in heaviest}
+    }
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, int]]:
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            timings[name.strip()] = {"self_us": int(self_us), "cumulative_us": int(cumulative_us)}
+        except ValueError:
+            continue
+    return timings
+
+
+class StubGeminiModel:
+    #stands in for genai.GenerativeModel; answers every prompt with a fixed prediction set
+
+    calls = 0
+
+    async def generate_content_async(self, contents, **kwargs):
+        StubGeminiModel.calls += 1
+        part = SimpleNamespace(text=json.dumps(STUB_PREDICTIONS))
+        candidate = SimpleNamespace(finish_reason=1, content=SimpleNamespace(parts=[part]))
+        return SimpleNamespace(candidates=[candidate])
+
+
+class _StubGeminiError(Exception):
+    pass
+
+
+# Minimal stand-in for the google.generativeai module when the SDK isn't installed:
+# GeminiService only needs genai.types for request configs and exception handling
+STUB_GENAI = SimpleNamespace(types=SimpleNamespace(
+    GenerationConfig=SimpleNamespace,
+    BlockedPromptException=type("BlockedPromptException", (_StubGeminiError,), {}),
+    StopCandidateException=type("StopCandidateException", (_StubGeminiError,), {})
+))
+
+
+async def start_stub_qloo():
+    """Local aiohttp server answering /v2/insights with a small fixed entity set."""
+
+    from aiohttp import web
+
+    async def insights(request):
+        entity_type = request.query.get("filter.type", "urn:entity:brand")
+        category = entity_type.rsplit(":", 1)[-1]
+        take = int(request.query.get("take", "5"))
+        page = int(request.query.get("page", "1"))
+        entities = [
+            {"entity_id": f"{category}-{page}-{i}", "name": f"Stub {category.title()} {page}-{i}", "type": entity_type}
+            for i in range(take)
+        ]
+        return web.json_response({"success": True, "results": {"entities": entities}})
+
+    app = web.Application()
+    app.router.add_get("/v2/insights", insights)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def call_asgi(app, method: str, path: str, body: Optional[Dict] = None) -> Dict:
+    """Serve one request through the ASGI app in-process and return status and JSON body."""
+
+    payload = json.dumps(body or {}).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "client": ("127.0.0.1", 0), "server": ("benchmark", 80),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+    }
+    messages = [{"type": "http.request", "body": payload, "more_body": False}]
+    response = {"status": None, "body": b""}
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return {"status": response["status"], "json": json.loads(response["body"] or b"null")}
+
+
+async def measure_cold_start(verbose: bool) -> Dict:
+    """In-process: import main, build services, start the lifespan, serve /api/analyze."""
+
+    results: Dict = {}
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    with quiet:
+        process_started = time.perf_counter()
+
+        started = time.perf_counter()
+        import main
+        results["import_main_ms"] = (time.perf_counter() - started) * 1000
+
+        registry = main.registry
+        for name in ("qloo", "gemini", "trend_analyzer"):
+            started = time.perf_counter()
+            getattr(registry, name)
+            results[f"construct_{name}_ms"] = (time.perf_counter() - started) * 1000
+
+        # Stub backends: local Qloo server, canned Gemini model
+        qloo_runner, qloo_url = await start_stub_qloo()
+        registry.qloo.base_url = qloo_url
+        registry.gemini._model = StubGeminiModel()
+        registry.gemini._model_loaded = True
+        try:
+            gemini_sdk = importlib.util.find_spec("google.generativeai") is not None
+        except ModuleNotFoundError:
+            # find_spec imports the parent package, and "google" itself is missing
+            gemini_sdk = False
+        import services.gemini_service as gemini_service
+        if gemini_sdk:
+            gemini_service._load_genai()
+        else:
+            gemini_service.genai = STUB_GENAI
+
+        try:
+            started = time.perf_counter()
+            async with main.lifespan(main.app):
+                results["lifespan_startup_ms"] = (time.perf_counter() - started) * 1000
+
+                started = time.perf_counter()
+                first = await call_asgi(main.app, "POST", "/api/analyze", SAMPLE_PREFERENCES)
+                results["first_analyze_ms"] = (time.perf_counter() - started) * 1000
+                results["time_to_first_analyze_ms"] = (time.perf_counter() - process_started) * 1000
+
+                started = time.perf_counter()
+                second = await call_asgi(main.app, "POST", "/api/analyze", SAMPLE_PREFERENCES)
+                results["warm_analyze_ms"] = (time.perf_counter() - started) * 1000
+        finally:
+            await qloo_runner.cleanup()
+            if not gemini_sdk:
+                gemini_service.genai = None
+
+    results = {key: round(value, 2) for key, value in results.items()}
+    results["first_analyze_status"] = first["status"]
+    results["warm_analyze_status"] = second["status"]
+    results["gemini_sdk_installed"] = gemini_sdk
+    results["gemini_stub_calls"] = StubGeminiModel.calls
+    # Without a stub round trip the analyze timings measure the sample-data fallback
+    results["analyze_valid"] = StubGeminiModel.calls > 0
+    results["streamlit_loaded_by_api"] = "streamlit" in sys.modules
+    return results
+
+
+def flatten(report: Dict) -> Dict[str, float]:
+    """Numeric metrics keyed by a dotted path, for diffing."""
+
+    flat = {}
+    for module, result in report["imports"].items():
+        if result.get("ok"):
+            flat[f"import.{module}"] = result["ms"]
+    analyze_valid = report["cold_start"].get("analyze_valid", True)
+    for key, value in report["cold_start"].items():
+        if key.endswith("_ms") and (analyze_valid or "analyze" not in key):
+            flat[f"cold_start.{key}"] = value
+    return flat
+
+
+def print_report(report: Dict) -> None:
+    print("⏱️  Cold import time (fresh interpreter, cumulative)")
+    for module, result in report["imports"].items():
+        if result["ok"]:
+            print(f"   {module:<36} {result['ms']:>9.1f} ms")
+        else:
+            print(f"   {module:<36} {'failed':>9}    {result['error']}")
+
+    main_import = report["imports"].get("main", {})
+    if main_import.get("ok"):
+        print("\n🏋️  Heaviest modules imported by main (self time)")
+        for name, ms in main_import["heaviest_self_ms"].items():
+            print(f"   {name:<36} {ms:>9.1f} ms")
+
+    print("\n🚀 Cold start (in-process, stub backends)")
+    for key, value in report["cold_start"].items():
+        if key.endswith("_ms"):
+            print(f"   {key:<36} {value:>9.1f} ms")
+        else:
+            print(f"   {key:<36} {value!s:>9}")
+    if not report["cold_start"].get("analyze_valid", True):
+        print("   ⚠️ Gemini stub never answered: analyze timings measure the fallback and are not compared")
+
+
+def compare(report: Dict, baseline: Dict, threshold: float, min_delta_ms: float) -> List[str]:
+    """Print current vs baseline and return the metrics that regressed."""
+
+    current, previous = flatten(report), flatten(baseline)
+    regressions = []
+    print(f"\n📊 Compared with baseline from {baseline.get('created_at', 'unknown')}")
+    for key in sorted(set(current) | set(previous)):
+        now, before = current.get(key), previous.get(key)
+        if now is None or before is None:
+            print(f"   {key:<48} {'new' if before is None else 'removed'}")
+            continue
+        delta = now - before
+        ratio = delta / before if before else 0.0
+        regressed = delta > min_delta_ms and ratio > threshold
+        marker = "🔺" if regressed else ("🔻" if delta < -min_delta_ms else "  ")
+        print(f"   {marker} {key:<45} {before:>9.1f} → {now:>9.1f} ms ({ratio * 100:+.0f}%)")
+        if regressed:
+            regressions.append(key)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time and cold-start benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh-interpreter runs per module (median)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to diff against")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run to --baseline")
+    parser.add_argument("--output", help="also write this run's report to a JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown counted as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore changes smaller than this")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if any metric regressed")
+    parser.add_argument("--verbose", action="store_true", help="show service logs during the cold start")
+    args = parser.parse_args()
+
+    os.environ.update(BENCH_ENV)
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "imports": {module: measure_import(module, args.repeat) for module in discover_modules()},
+        "cold_start": asyncio.run(measure_cold_start(args.verbose))
+    }
+    print_report(report)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold, args.min_delta_ms)
+
+    for path in filter(None, [args.output, args.baseline if args.save_baseline else None]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\n💾 Report saved to {path}")
+
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} metric(s) regressed: {', '.join(regressions)}")
+        return 1 if args.fail_on_regression else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,82 @@
 import os
-import streamlit as st
+import sys
+from functools import lru_cache
+
+
+def _load_dotenv():
+    # .env is optional: python-dotenv may be missing and the file may not exist
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv(os.getenv("CULTREND_ENV_FILE") or None)
+
+
+def _streamlit_secrets():
+    # Only consult st.secrets when we are running inside Streamlit (the dashboard
+    # has already imported it); the API process never pays for the import
+    if "streamlit" not in sys.modules:
+        return None
+    try:
+        return sys.modules["streamlit"].secrets
+    except Exception:
+        return None
+
+
+def _secret(section, key):
+    secrets = _streamlit_secrets()
+    if secrets is None:
+        return None
+    try:
+        return secrets.get(section, {}).get(key)
+    except Exception:
+        # No secrets.toml in this deployment
+        return None
+
 
 class Settings:
     def __init__(self):
-        self.qloo_base_url = "https://hackathon.api.qloo.com"
+        _load_dotenv()
         
+        self.qloo_base_url = "https://hackathon.api.qloo.com"
         
+        # Streamlit secrets (dashboard host) first, then environment / .env
         self.qloo_api_key = (
-            st.secrets.get("qloo", {}).get("api_key") or 
+            _secret("qloo", "api_key") or
             os.getenv("QLOO_API_KEY")
         )
         self.gemini_api_key = (
-            st.secrets.get("gemini", {}).get("api_key") or 
-            os.getenv("GOOGLE_API_KEY") or 
+            _secret("gemini", "api_key") or
+            os.getenv("GOOGLE_API_KEY") or
             os.getenv("GEMINI_API_KEY")
         )
         
+        # Optional SQLite response store shared by all local processes
+        self.qloo_response_store_path = os.getenv("QLOO_RESPONSE_STORE_PATH")
+        self.qloo_response_store_max_mb = int(os.getenv("QLOO_RESPONSE_STORE_MAX_MB", "50"))
+        
+        # Aggregate outbound Qloo request rate for this process
+        self.qloo_rate_limit_per_sec = float(os.getenv("QLOO_RATE_LIMIT_PER_SEC", "10"))
+        self.qloo_rate_limit_burst = int(os.getenv("QLOO_RATE_LIMIT_BURST", "20"))
+        
+        # Upper bound on Qloo HTTP attempts and request time per cultural profile
+        self.qloo_profile_call_budget = int(os.getenv("QLOO_PROFILE_CALL_BUDGET", "12"))
+        self.qloo_profile_time_budget_ms = float(os.getenv("QLOO_PROFILE_TIME_BUDGET_MS", "20000"))
+        
+        # Optional Gemini key check at startup; it spends one generation call per worker, so off by default
+        self.gemini_readiness_check = os.getenv("GEMINI_READINESS_CHECK", "false").lower() in ("1", "true", "yes")
         
         if not self.qloo_api_key or not self.gemini_api_key:
-            st.error("🔑 API keys required")
-            st.stop()
+            if "streamlit" in sys.modules:
+                st = sys.modules["streamlit"]
+                st.error("🔑 API keys required")
+                st.stop()
+            else:
+                # API workers keep running; the services fall back to sample data
+                print("⚠️ API keys missing (QLOO_API_KEY, GOOGLE_API_KEY/GEMINI_API_KEY) - using sample data")
 
 # Cache the settings instance
-@st.cache_resource
+@lru_cache(maxsize=None)
 def get_settings():
     return Settings()
 
@@ -1,7 +1,6 @@
 import streamlit as st
 import os
 import random
-import asyncio
 import base64
 from datetime import datetime
 
@@ -18,7 +17,7 @@ from models.trend_models import BrandIdentityKit, CulturalProfile, UserPreferenc
 from services.explanation_service import ExplanationService
 from services.recommendation_service import RecommendationService
 from content.content_data import popular_anime, travel_areas, football_clubs
-from services.trend_analyzer import TrendAnalyzer
+from services.registry import get_service_registry
 
 def get_api_keys():
     """Get API keys from Streamlit secrets"""
@@ -89,7 +88,8 @@ if "conversation_stage" not in st.session_state:
 if "smalltalk_turns" not in st.session_state:
     st.session_state.smalltalk_turns = 0
 if "analyzer" not in st.session_state:
-    st.session_state.analyzer = TrendAnalyzer()
+    # Shared by every session in this process: one set of Qloo/Gemini clients, caches and metrics
+    st.session_state.analyzer = get_service_registry().trend_analyzer
 if "last_cultural_profile" not in st.session_state:
     st.session_state.last_cultural_profile = None
 if "show_brand_kit_prompt" not in st.session_state:
@@ -241,7 +241,7 @@ if st.session_state.show_brand_kit_prompt:
         if st.session_state.last_cultural_profile:
             with st.spinner("Crafting your personal brand identity..."):
                 analyzer = st.session_state.analyzer
-                brand_kit = asyncio.run(analyzer.generate_brand_identity(st.session_state.last_cultural_profile))
+                brand_kit = get_service_registry().run(analyzer.generate_brand_identity(st.session_state.last_cultural_profile))
                 
                 st.session_state.messages.append({
                     "role": "assistant",
@@ -342,7 +342,7 @@ if send_btn and user_input and user_input.strip() != st.session_state.last_user_
             if st.session_state.last_cultural_profile:
                 with st.spinner("Creating your brand identity..."):
                     analyzer = st.session_state.analyzer
-                    brand_kit = asyncio.run(analyzer.generate_brand_identity(st.session_state.last_cultural_profile))
+                    brand_kit = get_service_registry().run(analyzer.generate_brand_identity(st.session_state.last_cultural_profile))
                     
                     st.session_state.messages.append({
                         "role": "assistant", "content": "Here's your personalized Brand Identity Kit:",
@@ -403,7 +403,7 @@ if send_btn and user_input and user_input.strip() != st.session_state.last_user_
                         
                         with st.spinner("Analyzing your cultural DNA..."):
                             analyzer = st.session_state.analyzer
-                            analysis = asyncio.run(analyzer.predict_trends(prefs, "90d"))
+                            analysis = get_service_registry().run(analyzer.predict_trends(prefs, "90d"))
                             profile = getattr(analysis, 'cultural_profile', None)
                         
                         if profile and getattr(profile, 'cultural_segments', None):
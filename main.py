@@ -1,15 +1,27 @@
 # main.py - FastAPI backend for TrendSeer
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from services.trend_analyzer import TrendAnalyzer
-from services.qloo_service import QlooService
-from services.gemini_service import GeminiService
+from services.registry import get_service_registry
 from models.trend_models import UserPreferences, CulturalProfile
 
+# One set of Qloo/Gemini clients per process, shared with the TrendAnalyzer
+registry = get_service_registry()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open pooled Qloo HTTP sessions, start background jobs (and the optional Gemini readiness check); release them on shutdown"""
+    await registry.start()
+    try:
+        yield
+    finally:
+        await registry.close()
+
 app = FastAPI(
     title="TrendSeer Cultural Intelligence API",
     description="Real-time cultural trend analysis powered by Qloo + Gemini AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS for frontend integration
@@ -21,11 +33,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
-trend_analyzer = TrendAnalyzer()
-qloo_service = QlooService()
-gemini_service = GeminiService()
-
 @app.get("/")
 async def root():
     return {
@@ -43,7 +50,7 @@ async def analyze_cultural_preferences(preferences: UserPreferences):
     - Output: Cultural profile + trend predictions with 98% confidence
     """
     try:
-        analysis = await trend_analyzer.predict_trends(preferences, "90d")
+        analysis = await registry.trend_analyzer.predict_trends(preferences, "90d")
         
         return {
             "success": True,
@@ -67,7 +74,7 @@ async def analyze_cultural_preferences(preferences: UserPreferences):
             "analysis_metadata": {
                 "total_predictions": analysis.total_predictions,
                 "average_confidence": analysis.average_confidence,
-                "timestamp": analysis.analysis_timestamp
+                "timestamp": analysis.analysis_date
             }
         }
         
@@ -78,7 +85,7 @@ async def analyze_cultural_preferences(preferences: UserPreferences):
 async def find_similar_profiles(profile_id: str):
     """Find culturally similar user profiles"""
     try:
-        similar_profiles = await qloo_service.get_similar_profiles(profile_id)
+        similar_profiles = await registry.qloo.get_similar_profiles(profile_id)
         return {
             "success": True,
             "profile_id": profile_id,
@@ -91,10 +98,11 @@ async def find_similar_profiles(profile_id: str):
 @app.get("/api/performance")
 async def get_performance_metrics():
     """Get system performance metrics"""
-    metrics = qloo_service.get_performance_metrics()
+    metrics = registry.qloo.get_performance_metrics()
     return {
         "success": True,
         "qloo_performance": metrics,
+        "gemini_status": registry.gemini.get_status(),
         "system_status": "operational"
     }
 
@@ -105,7 +113,7 @@ async def predict_trends_endpoint(
 ):
     """Generate trend predictions for existing cultural profile"""
     try:
-        predictions = await gemini_service.analyze_cultural_trends(cultural_profile, timeframe)
+        predictions = await registry.gemini.analyze_cultural_trends(cultural_profile, timeframe)
         return {
             "success": True,
             "predictions": [
@@ -0,0 +1,100 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class EntityMetadata:
+    #immutable per-entity data, shared across profiles through EntityInternStore
+
+    entity_id: str
+    name: str
+    entity_type: str = "urn:entity"
+    category: str = "unknown"
+    popularity: Optional[float] = None
+    tag_ids: Tuple[str, ...] = ()
+
+    @staticmethod
+    def id_from_response(raw: Dict) -> str:
+        """Qloo entity_id, or a name-derived id when the response has none."""
+
+        entity_id = raw.get("entity_id") or raw.get("id")
+        if entity_id:
+            return str(entity_id)
+        name = raw.get("name") or raw.get("title") or "Unknown"
+        return f"name:{name.lower()}"
+
+    @classmethod
+    def from_response(cls, raw: Dict, classify: Optional[Callable[[Dict], str]] = None,
+                      category: Optional[str] = None) -> "EntityMetadata":
+        """Decode one raw response entity; category comes from `category` or `classify(raw)`."""
+
+        tag_ids = []
+        for tag in raw.get("tags") or []:
+            tag_id = (tag.get("id") or tag.get("tag_id")) if isinstance(tag, dict) else tag
+            if isinstance(tag_id, str):
+                tag_ids.append(tag_id)
+
+        popularity = raw.get("popularity")
+        return cls(
+            entity_id=cls.id_from_response(raw),
+            name=raw.get("name") or raw.get("title") or "Unknown",
+            entity_type=raw.get("type") or "urn:entity",
+            category=category or (classify(raw) if classify else "unknown"),
+            popularity=float(popularity) if isinstance(popularity, (int, float)) else None,
+            tag_ids=tuple(tag_ids)
+        )
+
+
+@dataclass(slots=True)
+class QlooEntity:
+    #per-profile view of an entity: a reference to shared metadata plus the methods that returned it
+
+    metadata: EntityMetadata
+    sources: List[str] = field(default_factory=list)
+
+    @property
+    def entity_id(self) -> str:
+        return self.metadata.entity_id
+
+    @property
+    def name(self) -> str:
+        return self.metadata.name
+
+    @property
+    def entity_type(self) -> str:
+        return self.metadata.entity_type
+
+    @property
+    def category(self) -> str:
+        return self.metadata.category
+
+    @property
+    def popularity(self) -> Optional[float]:
+        return self.metadata.popularity
+
+    @property
+    def tag_ids(self) -> Tuple[str, ...]:
+        return self.metadata.tag_ids
+
+    def add_source(self, source: str) -> None:
+        """Record that another method also returned this entity."""
+
+        if source not in self.sources:
+            self.sources.append(source)
+
+
+@dataclass(frozen=True, slots=True)
+class GlobalContextSnapshot:
+    #user-independent Qloo responses, published as a whole by the global-context refresher
+
+    movies: Optional[Dict] = None
+    cross_domain: Optional[Dict] = None
+    similar_profiles: Optional[Dict] = None
+    published_at: datetime = field(default_factory=datetime.now)
+    published_monotonic: float = 0.0
+
+    def age_seconds(self, now: float) -> float:
+        """Seconds since publication, given the current time.monotonic()."""
+
+        return max(0.0, now - self.published_monotonic)
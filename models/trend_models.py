@@ -19,6 +19,9 @@ class CulturalProfile(BaseModel):
     cross_domain_connections:Dict[str,List[str]]
     behavioral_indicators:Dict[str,float]
     confidence_score:float
+    qloo_calls_used:int=0
+    qloo_time_ms:float=0.0
+    qloo_calls_skipped:int=0
     
 class TrendPrediction(BaseModel):
     #single trend prediction
@@ -0,0 +1,122 @@
+# services/approach_stats.py
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+@dataclass(slots=True)
+class ApproachStats:
+    #running outcome statistics for one approach under one preference shape
+
+    attempts: int = 0
+    successes: int = 0
+    skipped: int = 0
+    success_ewma: float = 1.0
+    latency_ewma_ms: float = 0.0
+
+    def record(self, success: bool, latency_ms: float, alpha: float) -> None:
+        if self.attempts == 0:
+            self.success_ewma = 1.0 if success else 0.0
+            self.latency_ewma_ms = latency_ms
+        else:
+            self.success_ewma += alpha * ((1.0 if success else 0.0) - self.success_ewma)
+            self.latency_ewma_ms += alpha * (latency_ms - self.latency_ewma_ms)
+        self.attempts += 1
+        if success:
+            self.successes += 1
+
+
+class AdaptiveApproachOrder:
+    """
+    Learn which fallback approach works for which preference shape.
+
+    Outcomes (entities or not, latency) are tracked per (shape, request_type)
+    with exponentially weighted averages, so the ordering follows recent API
+    behaviour. Chains are reordered by recent success rate, then latency;
+    approaches with fewer than min_samples outcomes are ranked optimistically
+    (as always successful) so they still get tried. An approach whose recent
+    success rate is below skip_below is dropped from the chain, except on
+    every explore_every-th run so it can recover; a chain is never emptied.
+    Thread-safe.
+    """
+
+    def __init__(self, alpha: float = 0.2, min_samples: int = 5, skip_below: float = 0.05,
+                 explore_every: int = 20):
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.skip_below = skip_below
+        self.explore_every = explore_every
+
+        self._stats: Dict[str, Dict[str, ApproachStats]] = {}
+        self._runs: Dict[str, int] = {}
+        self.reordered_chains = 0
+        self._lock = threading.Lock()
+
+    def order(self, shape: str, approaches: Sequence[Tuple[Dict, str]],
+              count_run: bool = True) -> List[Tuple[Dict, str]]:
+        """
+        Return the approaches in learned order, with persistently empty ones skipped.
+
+        count_run=False previews the order (e.g. for batch planning) without
+        advancing the exploration counter or the skip counts.
+        """
+
+        with self._lock:
+            approaches = list(approaches)
+            shape_stats = self._stats.get(shape, {})
+            stats = [shape_stats.get(request_type) for _, request_type in approaches]
+            learned = [s is not None and s.attempts >= self.min_samples for s in stats]
+
+            run = self._runs.get(shape, 0) + (1 if count_run else 0)
+            if count_run:
+                self._runs[shape] = run
+
+            if len(approaches) < 2 or not any(learned):
+                return approaches
+
+            def rank_key(i: int) -> Tuple[float, float, int]:
+                if not learned[i]:
+                    # Optimistic, but never ahead of an equally good approach we have data on
+                    return (-1.0, float("inf"), i)
+                return (-stats[i].success_ewma, stats[i].latency_ewma_ms, i)
+
+            ranked = sorted(range(len(approaches)), key=rank_key)
+            if count_run and ranked != list(range(len(approaches))):
+                self.reordered_chains += 1
+
+            if run > 0 and run % self.explore_every == 0:
+                return [approaches[i] for i in ranked]
+
+            kept = [i for i in ranked if not learned[i] or stats[i].success_ewma >= self.skip_below] or ranked[:1]
+            if count_run:
+                for i in ranked:
+                    if i not in kept:
+                        stats[i].skipped += 1
+            return [approaches[i] for i in kept]
+
+    def record(self, shape: str, request_type: str, success: bool, latency_ms: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(shape, {}).setdefault(request_type, ApproachStats())
+            stats.record(success, latency_ms, self.alpha)
+
+    def stats(self) -> Dict[str, Any]:
+        """Learned statistics per preference shape and approach."""
+
+        with self._lock:
+            return {
+                "reordered_chains": self.reordered_chains,
+                "shapes": {
+                    shape: {
+                        request_type: {
+                            "attempts": s.attempts,
+                            "successes": s.successes,
+                            "success_rate": f"{(s.successes / max(1, s.attempts)) * 100:.1f}%",
+                            "recent_success_rate": round(s.success_ewma, 3),
+                            "recent_latency_ms": round(s.latency_ewma_ms, 1),
+                            "skipped": s.skipped
+                        }
+                        for request_type, s in approaches.items()
+                    }
+                    for shape, approaches in self._stats.items()
+                }
+            }
@@ -0,0 +1,45 @@
+# services/call_budget.py
+import time
+
+
+class CallBudget:
+    """
+    Per-profile allowance of Qloo HTTP attempts and of time spent in them.
+
+    Every attempt (retries included) must be granted by try_acquire() before
+    it is sent and reports its duration through release(); a granted attempt
+    that is never sent is handed back with refund(). Once either
+    max_calls attempts have been granted or max_ms of request time has been
+    spent, further attempts are refused and counted as skipped.
+    """
+
+    def __init__(self, max_calls: float, max_ms: float):
+        self.max_calls = max_calls
+        self.max_ms = max_ms
+
+        self.calls_used = 0
+        self.ms_used = 0.0
+        self.skipped_calls = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.calls_used >= self.max_calls or self.ms_used >= self.max_ms
+
+    def try_acquire(self) -> bool:
+        """Grant one call, or refuse (and count the skip) if the budget is spent."""
+
+        if self.exhausted:
+            self.skipped_calls += 1
+            return False
+        self.calls_used += 1
+        return True
+
+    def refund(self) -> None:
+        """Give back a granted call that was never sent (e.g. turned away by the rate limiter)."""
+
+        self.calls_used = max(0, self.calls_used - 1)
+
+    def release(self, started_at: float) -> None:
+        """Charge the time since started_at (a time.monotonic() value) to the budget."""
+
+        self.ms_used += (time.monotonic() - started_at) * 1000
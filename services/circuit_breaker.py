@@ -0,0 +1,143 @@
+# services/circuit_breaker.py
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker driven by a rolling error rate.
+
+    - closed: requests flow; outcomes are recorded over the last window_seconds.
+      Once at least minimum_calls are recorded and the failure rate (errors and
+      timeouts) reaches failure_rate_threshold, the circuit opens.
+    - open: requests are rejected immediately for open_seconds.
+    - half-open: a single probe request is let through. Success closes the
+      circuit, failure re-opens it.
+
+    Thread-safe.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_rate_threshold: float = 0.5, window_seconds: float = 60.0,
+                 minimum_calls: int = 5, open_seconds: float = 30.0, probe_timeout: float = 30.0):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_seconds = window_seconds
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.probe_timeout = probe_timeout
+
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        # Reentrant: state transitions call each other
+        self._lock = threading.RLock()
+
+        self.times_opened = 0
+        self.rejected_calls = 0
+        self.recorded_timeouts = 0
+
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit turns half-open once open_seconds have passed."""
+
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                self._state = self.HALF_OPEN
+                self._probe_started_at = None
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+
+            if state == self.HALF_OPEN:
+                now = time.monotonic()
+                # One probe at a time; a probe that never reported back (cancelled) expires
+                if self._probe_started_at is None or now - self._probe_started_at >= self.probe_timeout:
+                    self._probe_started_at = now
+                    return True
+
+            self.rejected_calls += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.reset()
+                return
+            self._record(True)
+
+    def record_failure(self, timeout: bool = False) -> None:
+        with self._lock:
+            if timeout:
+                self.recorded_timeouts += 1
+
+            if self.state == self.HALF_OPEN:
+                self.trip()
+                return
+
+            self._record(False)
+            total, failures = self._window_counts()
+            if total >= self.minimum_calls and failures / total >= self.failure_rate_threshold:
+                self.trip()
+
+    def trip(self) -> None:
+        """Force the circuit open (e.g. after a failed health check)."""
+
+        with self._lock:
+            if self._state != self.OPEN:
+                self.times_opened += 1
+                print(f"⛔ Qloo circuit opened for {self.open_seconds:.0f}s")
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_started_at = None
+
+    def reset(self) -> None:
+        """Force the circuit closed (e.g. after a successful health check)."""
+
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            print("✅ Qloo circuit closed - API recovered")
+            self._state = self.CLOSED
+            self._outcomes.clear()
+            self._probe_started_at = None
+
+    def _record(self, ok: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, ok))
+        self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _window_counts(self) -> Tuple[int, int]:
+        self._prune(time.monotonic())
+        total = len(self._outcomes)
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return total, failures
+
+    def stats(self) -> Dict[str, Any]:
+        """State and rolling error rate for monitoring."""
+
+        with self._lock:
+            total, failures = self._window_counts()
+            return {
+                "state": self.state,
+                "window_calls": total,
+                "window_failure_rate": f"{(failures / max(1, total)) * 100:.1f}%",
+                "times_opened": self.times_opened,
+                "rejected_calls": self.rejected_calls,
+                "recorded_timeouts": self.recorded_timeouts
+            }
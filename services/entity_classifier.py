@@ -0,0 +1,174 @@
+# services/entity_classifier.py
+import json
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_KNOWN_ENTITIES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "content", "known_entities.json"
+)
+
+ENTITY_CATEGORIES = ("brand", "artist", "movie", "place")
+
+
+class AhoCorasickAutomaton:
+    """
+    Multi-pattern substring matcher.
+
+    Every pattern carries a (priority, label) payload. After build(), best_match()
+    scans a text once and returns the lowest-priority payload among all patterns
+    occurring anywhere in it, or None.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[Optional[Tuple[int, str]]] = [None]
+        self._built = False
+
+    def add(self, pattern: str, priority: int, label: str) -> None:
+        if not pattern:
+            return
+
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+            node = next_node
+
+        payload = (priority, label)
+        if self._best[node] is None or payload < self._best[node]:
+            self._best[node] = payload
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links breadth-first and fold outputs along them."""
+
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+
+        self._built = True
+
+    def best_match(self, text: str) -> Optional[Tuple[int, str]]:
+        if not self._built:
+            self.build()
+
+        best = None
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+
+            found = self._best[node]
+            if found is not None and (best is None or found < best):
+                best = found
+                if best[0] == 0:
+                    break
+        return best
+
+
+class EntityClassifier:
+    """
+    Classify Qloo entities as brand / artist / movie / place.
+
+    Built once from a data file (content/known_entities.json by default):
+    - an explicit urn:entity:<category> in the entity's type/types wins;
+    - otherwise the lower-cased name is scanned once against every known name
+      and fallback pattern, with known names outranking patterns and earlier
+      categories outranking later ones;
+    - tag ids (urn:tag:genre:brand:..., etc.) decide before the generic
+      fallback patterns do.
+    """
+
+    def __init__(self, path: str = DEFAULT_KNOWN_ENTITIES_PATH):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.tag_prefixes: Dict[str, str] = data.get("tag_prefixes", {})
+        self.automaton = AhoCorasickAutomaton()
+        self.pattern_count = 0
+
+        # Known names first (priorities 0..n), then fallback patterns after them
+        categories = list(data.get("categories", {}).items())
+        for priority, (category, names) in enumerate(categories):
+            for name in names:
+                self.automaton.add(name.lower(), priority, category)
+                self.pattern_count += 1
+
+        self._fallback_priority_start = len(categories)
+        for offset, (category, patterns) in enumerate(data.get("fallback_patterns", {}).items()):
+            for pattern in patterns:
+                self.automaton.add(pattern.lower(), self._fallback_priority_start + offset, category)
+                self.pattern_count += 1
+
+        self.automaton.build()
+
+    def classify(self, entity: Dict) -> str:
+        """Return the entity's category, or "unknown"."""
+
+        category = self._category_from_types(entity)
+        if category:
+            return category
+
+        match = self.automaton.best_match(str(entity.get("name") or "").lower())
+        if match and match[0] < self._fallback_priority_start:
+            return match[1]
+
+        category = self._category_from_tags(entity)
+        if category:
+            return category
+
+        return match[1] if match else "unknown"
+
+    def _category_from_types(self, entity: Dict) -> Optional[str]:
+        types = entity.get("types") or []
+        if isinstance(types, str):
+            types = [types]
+        for entity_type in [entity.get("type")] + list(types):
+            if isinstance(entity_type, str) and entity_type.startswith("urn:entity:"):
+                category = entity_type[len("urn:entity:"):].split(":", 1)[0]
+                if category in ENTITY_CATEGORIES:
+                    return category
+        return None
+
+    def _category_from_tags(self, entity: Dict) -> Optional[str]:
+        for tag in entity.get("tags") or []:
+            tag_id = (tag.get("id") or tag.get("tag_id")) if isinstance(tag, dict) else tag
+            if not isinstance(tag_id, str):
+                continue
+            for prefix, category in self.tag_prefixes.items():
+                if tag_id.startswith(prefix):
+                    return category
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_entity_classifier(path: str = DEFAULT_KNOWN_ENTITIES_PATH) -> EntityClassifier:
+    """Load the classifier once per process and data file."""
+
+    classifier = EntityClassifier(path)
+    print(f"✅ Entity classifier loaded ({classifier.pattern_count} patterns)")
+    return classifier
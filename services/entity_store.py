@@ -0,0 +1,76 @@
+# services/entity_store.py
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from models.qloo_models import EntityMetadata
+
+
+class EntityInternStore:
+    """
+    Cross-request interning store for Qloo entity metadata.
+
+    Popular entities (Nike, Netflix, Coldplay ...) come back in almost every
+    response. The store keeps one EntityMetadata per entity_id, bounded by
+    max_entries with LRU eviction, and profiles hold references to it instead
+    of their own copies. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, EntityMetadata]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, entity_id: str) -> Optional[EntityMetadata]:
+        with self._lock:
+            metadata = self._entries.get(entity_id)
+            if metadata is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entity_id)
+            self.hits += 1
+            return metadata
+
+    def intern(self, metadata: EntityMetadata) -> EntityMetadata:
+        """Return the canonical instance for metadata.entity_id, storing this one if new."""
+
+        with self._lock:
+            existing = self._entries.get(metadata.entity_id)
+            if existing is not None:
+                self._entries.move_to_end(metadata.entity_id)
+                return existing
+
+            self._entries[metadata.entity_id] = metadata
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return metadata
+
+    def get_many(self, entity_ids: Iterable[str]) -> Dict[str, EntityMetadata]:
+        """Batch lookup; ids that are not (or no longer) interned are left out."""
+
+        found = {}
+        for entity_id in entity_ids:
+            metadata = self.get(entity_id)
+            if metadata is not None:
+                found[entity_id] = metadata
+        return found
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": f"{(self.hits / max(1, lookups)) * 100:.1f}%",
+                "evictions": self.evictions
+            }
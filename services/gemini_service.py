@@ -1,65 +1,150 @@
 # services/gemini_service.py
-import google.generativeai as genai
-import streamlit as st
 import os
 from typing import Dict, List, Optional
 from config import settings
 from models.trend_models import CulturalProfile, TrendPrediction
 import json
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
+
+# google.generativeai is heavy to import; it is loaded the first time a model is set up
+genai = None
+
+
+def _load_genai():
+    global genai
+    if genai is None:
+        import google.generativeai
+        genai = google.generativeai
+    return genai
+
 
 class GeminiService:
     """Service to interact with Google Gemini for trend analysis with comprehensive error handling"""
     
     def __init__(self):
+        # Initialize finish reasons mapping
+        self.finish_reasons = {
+            0: "FINISH_REASON_UNSPECIFIED",
+            1: "STOP",  # Natural completion - success
+            2: "SAFETY",  # Blocked by safety filters
+            3: "RECITATION",  # Blocked for copyright
+            4: "OTHER"  # Other reason
+        }
+        
+        # Per-call timeout (seconds). generate_content_async is only used on the
+        # long-lived loop start() ran on (its gRPC client is bound to one loop);
+        # other callers (dashboard asyncio.run) use a small dedicated pool
+        self.request_timeout = 45
+        self.max_blocking_workers = 4
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._service_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.timed_out_calls = 0
+        
+        # Guards lazy model/pool setup
+        self._lock = threading.Lock()
+        
+        # The model is configured on first use; construction makes no network calls.
+        # Key verification is an optional background readiness check (see start(),
+        # enabled with GEMINI_READINESS_CHECK).
+        self._model = None
+        self._model_loaded = False
+        self.readiness_check_enabled = settings.gemini_readiness_check
+        self.readiness_timeout = 15
+        self._readiness_task: Optional[asyncio.Task] = None
+        self.ready: Optional[bool] = None
+        self.last_readiness_check: Optional[datetime] = None
+    
+    @property
+    def model(self):
+        """The Gemini model, configured on first access (None without a usable API key)."""
+        
+        with self._lock:
+            if not self._model_loaded:
+                self._model_loaded = True
+                try:
+                    api_key = self._get_api_key()
+                    if not api_key:
+                        print("❌ No API key found")
+                        return None
+                    
+                    _load_genai().configure(api_key=api_key)
+                    self._model = genai.GenerativeModel('gemini-1.5-flash')
+                    
+                except Exception as e:
+                    print(f"❌ Gemini model setup failed: {e}")
+                    self._model = None
+            return self._model
+    
+    async def start(self) -> None:
+        """Schedule the background readiness check, if enabled. Called from application startup."""
+        self._service_loop = asyncio.get_running_loop()
+        if self.readiness_check_enabled and self._readiness_task is None:
+            self._readiness_task = asyncio.create_task(self.check_readiness())
+    
+    async def close(self) -> None:
+        """Cancel a pending readiness check and release the blocking-call pool. Called from application shutdown."""
+        if self._readiness_task is not None:
+            self._readiness_task.cancel()
+            self._readiness_task = None
+        self._service_loop = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    async def check_readiness(self) -> bool:
+        """
+        Verify the API key with a tiny generation request.
+        
+        Only records the outcome in `ready`; analysis calls don't wait for it
+        and still fall back to sample data on their own errors.
+        """
+        
+        ok = False
         try:
-            # Initialize finish reasons mapping
-            self.finish_reasons = {
-                0: "FINISH_REASON_UNSPECIFIED",
-                1: "STOP",  # Natural completion - success
-                2: "SAFETY",  # Blocked by safety filters
-                3: "RECITATION",  # Blocked for copyright
-                4: "OTHER"  # Other reason
-            }
-            
-            # Get and validate API key
-            api_key = self._get_api_key()
-            if not api_key:
-                print("❌ No API key found")
-                self.model = None
-                return
-            
-            # Configure and test the API key
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-            
-            # Quick connection test
-            test_response = self.model.generate_content(
-                "Hello",
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.1,
-                    max_output_tokens=10,
+            if self.model:
+                await asyncio.wait_for(
+                    self._generate_content(
+                        "Hello",
+                        generation_config=genai.types.GenerationConfig(
+                            temperature=0.1,
+                            max_output_tokens=10,
+                        )
+                    ),
+                    timeout=self.readiness_timeout
                 )
-            )
-            print("✅ Gemini API key verified successfully")
-            
+                ok = True
+                print("✅ Gemini API key verified successfully")
         except Exception as e:
             print(f"❌ Gemini API key verification failed: {e}")
-            self.model = None
+        
+        self.ready = ok
+        self.last_readiness_check = datetime.now()
+        return ok
+    
+    def get_status(self) -> Dict[str, any]:
+        """Readiness and timeout counters for monitoring."""
+        
+        return {
+            "readiness_check_enabled": self.readiness_check_enabled,
+            "ready": self.ready,
+            "last_readiness_check": self.last_readiness_check.isoformat() if self.last_readiness_check else None,
+            "request_timeout_seconds": self.request_timeout,
+            "timed_out_calls": self.timed_out_calls
+        }
     
     def _get_api_key(self) -> Optional[str]:
         """Enhanced API key retrieval with multiple fallback methods"""
-        # Try Streamlit secrets first
-        try:
-            key = st.secrets["gemini"]["api_key"]
-            if key and len(key) > 20:  # Basic validation
-                print(f"✅ Found API key in Streamlit secrets (length: {len(key)})")
-                return key
-            else:
-                print("⚠️ API key in secrets appears invalid")
-        except Exception as e:
-            print(f"⚠️ Could not access Streamlit secrets: {e}")
+        # Settings already resolved Streamlit secrets / environment / .env for this host
+        key = settings.gemini_api_key
+        if key and len(key) > 20:  # Basic validation
+            print(f"✅ Found API key in settings (length: {len(key)})")
+            return key
+        elif key:
+            print("⚠️ API key in settings appears invalid")
         
         # Try environment variables as fallback
         for env_var in ["GOOGLE_API_KEY", "GEMINI_API_KEY"]:
@@ -86,7 +171,7 @@ class GeminiService:
             prompt = self._create_safe_prompt(cultural_profile, timeframe)
             
             # Call Gemini with optimized settings
-            response = self.model.generate_content(
+            response = await self._generate_content(
                 prompt,
                 generation_config=genai.types.GenerationConfig(
                     temperature=0.7,  # Balanced creativity
@@ -133,6 +218,10 @@ class GeminiService:
                 print("⚠️ Could not extract valid response from Gemini, using sample data")
                 return self._create_enhanced_sample_predictions(cultural_profile, timeframe)
                 
+        except asyncio.TimeoutError:
+            print(f"⏰ Gemini call exceeded {self.request_timeout}s, using enhanced sample data")
+            return self._create_enhanced_sample_predictions(cultural_profile, timeframe)
+            
         except genai.types.BlockedPromptException:
             print("🛡️ Prompt was blocked by Gemini safety filters")
             return self._create_enhanced_sample_predictions(cultural_profile, timeframe)
@@ -157,7 +246,7 @@ class GeminiService:
             print("🤖 Sending custom prompt to Gemini AI...")
             
             # Call Gemini with the custom prompt
-            response = self.model.generate_content(
+            response = await self._generate_content(
                 custom_prompt,
                 generation_config=genai.types.GenerationConfig(
                     temperature=0.7,
@@ -197,10 +286,44 @@ class GeminiService:
                 print("⚠️ Could not extract valid response from Gemini")
                 return ""
                 
+        except asyncio.TimeoutError:
+            print(f"⏰ Gemini custom prompt exceeded {self.request_timeout}s")
+            return ""
+            
         except Exception as e:
             print(f"❌ Error in analyze_cultural_trends_with_custom_prompt: {e}")
             return ""
     
+    async def _generate_content(self, contents, **kwargs):
+        """
+        Run one generate_content call without blocking the event loop.
+        
+        Uses the SDK's native async call when running on the long-lived
+        service loop, otherwise the blocking call runs on a bounded thread
+        pool. Either way the call is abandoned after request_timeout seconds
+        (asyncio.TimeoutError).
+        """
+        
+        loop = asyncio.get_running_loop()
+        if loop is self._service_loop and hasattr(self.model, "generate_content_async"):
+            call = self.model.generate_content_async(contents, **kwargs)
+        else:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_blocking_workers, thread_name_prefix="gemini"
+                    )
+                executor = self._executor
+            call = loop.run_in_executor(
+                executor, partial(self.model.generate_content, contents, **kwargs)
+            )
+        
+        try:
+            return await asyncio.wait_for(call, timeout=self.request_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out_calls += 1
+            raise
+    
     def _handle_gemini_response(self, response) -> Optional[str]:
         """Safely extract text from Gemini response with comprehensive error handling"""
         
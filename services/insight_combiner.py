@@ -0,0 +1,164 @@
+# services/insight_combiner.py
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.qloo_models import EntityMetadata, QlooEntity
+from services.entity_store import EntityInternStore
+
+ENTITY_CATEGORIES = ("brand", "movie", "artist", "place")
+
+# Canonical method order; result() sorts entities and sources by it so the
+# combined output does not depend on which Qloo call finished first
+METHOD_ORDER = [
+    "preference_targeted_brands",
+    "demographic_insights",
+    "cultural_movies",
+    "cultural_artists",
+    "cultural_places",
+    "cross_domain_analysis"
+]
+
+
+class InsightCombiner:
+    """
+    Incrementally merge insight responses as each Qloo call completes.
+
+    add() can be called in any order; entities are decoded once (through the
+    interning store), deduplicated by entity_id and counted immediately, so the
+    caller can decide after every response whether the data is already rich
+    enough to stop waiting for the rest.
+    """
+
+    def __init__(self, classify: Callable[[Dict], str], entity_store: EntityInternStore):
+        self._classify = classify
+        self._entity_store = entity_store
+
+        self._entities: Dict[str, QlooEntity] = {}
+        self._order_keys: Dict[str, Tuple[int, int]] = {}
+        self._category_counts = {category: 0 for category in ENTITY_CATEGORIES}
+        self._data_sources: List[Tuple[int, str]] = []
+        self._entity_breakdown: Dict[str, Dict[str, int]] = {}
+        self._input_sources = 0
+        self._duplicates_merged = 0
+
+    @property
+    def total_entities(self) -> int:
+        return len(self._entities)
+
+    @property
+    def brand_count(self) -> int:
+        return self._category_counts["brand"]
+
+    def add(self, method_name: str, insight: Optional[Dict]) -> None:
+        """Merge one method's result (a standard response or a cultural-context dict)."""
+
+        if not insight or not isinstance(insight, dict):
+            return
+
+        self._input_sources += 1
+        if "results" in insight:
+            # Standard insights response, classified by name/tags/types
+            self._merge_response(method_name, insight)
+        else:
+            # Cultural context with one response per entity type
+            for key, value in insight.items():
+                if key in ["movies", "artists", "places"] and value:
+                    self._merge_response(f"cultural_{key}", value, category=key[:-1])
+
+    def _merge_response(self, method_name: str, response: Dict, category: Optional[str] = None) -> None:
+        rank = self._method_rank(method_name)
+        raw_entities = response.get("results", {}).get("entities", [])
+        type_counts = {"brand": 0, "movie": 0, "artist": 0, "place": 0, "other": 0, "duplicate": 0}
+
+        for index, raw in enumerate(raw_entities):
+            try:
+                entity_id = EntityMetadata.id_from_response(raw)
+                order_key = (rank, index)
+
+                existing = self._entities.get(entity_id)
+                if existing is not None:
+                    existing.add_source(method_name)
+                    self._order_keys[entity_id] = min(self._order_keys[entity_id], order_key)
+                    self._duplicates_merged += 1
+                    type_counts["duplicate"] += 1
+                    continue
+
+                # Decode and classify only entities the interning store hasn't seen yet
+                metadata = self._entity_store.get(entity_id)
+                if metadata is None:
+                    metadata = self._entity_store.intern(
+                        EntityMetadata.from_response(raw, classify=self._classify, category=category)
+                    )
+
+                self._entities[entity_id] = QlooEntity(metadata=metadata, sources=[method_name])
+                self._order_keys[entity_id] = order_key
+
+                if metadata.category in self._category_counts:
+                    self._category_counts[metadata.category] += 1
+                    type_counts[metadata.category] += 1
+                else:
+                    type_counts["other"] += 1
+                    print(f"      ⚠️ Unclassified entity: {metadata.name} (type: {metadata.entity_type})")
+
+            except Exception as e:
+                print(f"⚠️ Error processing entity {raw.get('name', 'Unknown') if isinstance(raw, dict) else raw}: {e}")
+                continue
+
+        self._entity_breakdown[method_name] = type_counts
+        self._data_sources.append((rank, f"{method_name}_{len(raw_entities)}_entities"))
+
+    def _method_rank(self, method_name: str) -> int:
+        if method_name in METHOD_ORDER:
+            return METHOD_ORDER.index(method_name)
+        return len(METHOD_ORDER)
+
+    def result(self) -> Dict:
+        """Build the combined-insights dict consumed by the profile parser."""
+
+        print("🔍 ENTITY COMBINATION DEBUG:")
+
+        ordered = sorted(self._entities, key=self._order_keys.__getitem__)
+        entities = []
+        for entity_id in ordered:
+            entity = self._entities[entity_id]
+            entity.sources.sort(key=self._method_rank)
+            entities.append(entity)
+
+        combined = {
+            "brand_entities": [],
+            "movie_entities": [],
+            "artist_entities": [],
+            "place_entities": [],
+            "total_entities": len(entities),
+            "data_sources": [source for _, source in sorted(self._data_sources, key=lambda item: item[0])],
+            "entities": entities,  # Unique QlooEntity objects across all methods
+            "debug_info": {
+                "combination_timestamp": datetime.now().isoformat(),
+                "input_sources": self._input_sources,
+                "duplicates_merged": self._duplicates_merged,
+                "entity_breakdown": {
+                    method: self._entity_breakdown[method]
+                    for method in sorted(self._entity_breakdown, key=self._method_rank)
+                }
+            }
+        }
+        for entity in entities:
+            if entity.category in ENTITY_CATEGORIES:
+                combined[f"{entity.category}_entities"].append(entity)
+
+        # CRITICAL: Consolidate entity counts
+        print("🔍 ENTITY CONSOLIDATION DEBUG:")
+        for category in ["brand_entities", "movie_entities", "artist_entities", "place_entities"]:
+            category_entities = combined[category]
+            if category_entities:
+                example = category_entities[0]
+                print(f"   📦 {category}: {len(category_entities)} entities")
+                print(f"      🔍 Example: {example.name} (sources: {', '.join(example.sources)})")
+
+        processing_log = [f"{method}: {counts}" for method, counts in combined["debug_info"]["entity_breakdown"].items()]
+        print(f"   📊 Total consolidated entities: {combined['total_entities']} "
+              f"({self._duplicates_merged} duplicates merged)")
+        print(f"   📈 Processing summary: {' | '.join(processing_log)}")
+        print(f"   ✅ Combination complete: {combined['total_entities']} total entities")
+
+        return combined
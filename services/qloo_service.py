@@ -2,11 +2,39 @@
 import aiohttp
 import asyncio
 import json
+import math
 import random
-from typing import Dict, List, Optional, Tuple
+import threading
+import time
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from config import settings
 from models.trend_models import UserPreferences, CulturalProfile
+from models.qloo_models import EntityMetadata, GlobalContextSnapshot, QlooEntity
+from services.response_cache import TTLCache, canonical_params_key
+from services.response_store import SQLiteResponseStore
+from services.circuit_breaker import CircuitBreaker
+from services.rate_limiter import TokenBucketLimiter
+from services.entity_classifier import get_entity_classifier
+from services.entity_store import EntityInternStore
+from services.insight_combiner import InsightCombiner
+from services.approach_stats import AdaptiveApproachOrder
+from services.call_budget import CallBudget
+
+# Absolute time.monotonic() deadline of the profile build currently running.
+# Set by create_cultural_profile; inherited by every task it fans out to.
+_request_deadline: ContextVar[Optional[float]] = ContextVar("qloo_request_deadline", default=None)
+
+# Call/time budget of the profile build currently running; every HTTP attempt draws from it
+_call_budget: ContextVar[Optional[CallBudget]] = ContextVar("qloo_call_budget", default=None)
+
+# Responses prefetched by create_cultural_profiles, keyed by canonical params and
+# replayed to every profile. None means the prefetch got no usable data (profiles
+# move on to their next approach); a prefetch that raised is absent, so profiles
+# send that query themselves.
+_batch_results: ContextVar[Optional[Dict[str, Optional[Dict]]]] = ContextVar("qloo_batch_results", default=None)
 
 class QlooService:
     """
@@ -33,20 +61,252 @@ class QlooService:
             'urn:tag:genre:brand:technology',
             'urn:tag:genre:brand:food_and_beverage'
         ]
+        # Multi-pattern name/tag classifier, built once per process from content/known_entities.json
+        self.entity_classifier = get_entity_classifier()
+        # Entity metadata is interned once per entity_id and shared by every profile
+        self.entity_store = EntityInternStore(max_entries=5000)
+        
         self.base_url = "https://hackathon.api.qloo.com"
         self.headers = {
             "X-Api-Key": settings.qloo_api_key,
             "Content-Type": "application/json"
         }
         
-        self.api_available = None
         self.request_timeout = 15
         self.max_retries = 2
         
+        # Availability is tracked by a circuit breaker instead of a one-shot flag;
+        # retries use jittered exponential backoff and honor Retry-After
+        self.circuit_breaker = CircuitBreaker()
+        self._api_checked = False
+        self.backoff_base = 0.5
+        self.backoff_max = 8.0
+        self.short_circuited_calls = 0
+        
+        # Shared token bucket capping the aggregate outbound request rate
+        self.rate_limiter = TokenBucketLimiter(
+            rate=settings.qloo_rate_limit_per_sec,
+            burst=settings.qloo_rate_limit_burst
+        )
+        self.profile_deadline = 30
+        self.rate_limited_calls = 0
+        
+        # Per-profile budget shared by all Qloo methods (HTTP attempts, retries included)
+        self.profile_call_budget = settings.qloo_profile_call_budget
+        self.profile_time_budget_ms = settings.qloo_profile_time_budget_ms
+        self.budget_skipped_calls = 0
+        self.budget_exhausted_profiles = 0
+        
+        # Background health prober (started by start()) keeps availability current;
+        # one flaky probe must not take the API offline, so the circuit is only
+        # forced open after several consecutive failed probes
+        self.health_probe_interval = 60
+        self.probe_failures_to_trip = 3
+        self._health_task: Optional[asyncio.Task] = None
+        self.health_probes = 0
+        self.consecutive_probe_failures = 0
+        self.last_probe_ok: Optional[bool] = None
+        self.last_probe_at: Optional[datetime] = None
+        self.last_probe_latency_ms: Optional[float] = None
+        
+        # User-independent contexts (movie, cross-domain, similar profiles) are
+        # fetched by a background refresher and read from an immutable snapshot
+        self.global_context_refresh_interval = 600
+        self._global_context: Optional[GlobalContextSnapshot] = None
+        self._global_context_task: Optional[asyncio.Task] = None
+        self.global_context_refreshes = 0
+        self.global_context_refresh_failures = 0
+        
+        # Per-branch timeouts (seconds) for the concurrent profile fan-out
+        self.method_timeouts = {
+            "preference_targeted_brands": 25,
+            "demographic_insights": 25,
+            "cultural_context": 20,
+            "cross_domain_analysis": 15
+        }
+        self.context_lookup_timeout = 18
+        
+        # Lazy pagination limits for deeper entity pulls
+        self.max_insight_pages = 5
+        self.artist_context_depth = 5
+        self.artist_context_page_size = 5
+        
+        # "Good enough" policy for the streaming combiner: stop waiting for the
+        # remaining methods once the data is rich enough or the budget is spent
+        self.early_exit_enabled = True
+        self.early_exit_min_entities = 15
+        self.early_exit_min_brands = 4
+        self.profile_latency_budget = 12.0
+        self.early_exits_richness = 0
+        self.early_exits_budget = 0
+        self.cancelled_branches = 0
+        
+        # Hedged fallback chains: start the next approach if the current one has
+        # not produced entities after hedge_delay seconds (0 = all in parallel)
+        self.hedging_enabled = True
+        self.hedge_delay = 2.0
+        self.hedged_chains = 0
+        self.hedges_fired = 0
+        self.hedge_wins = 0
+        
+        # Response cache for /v2/insights, TTL (seconds) chosen by request_type.
+        # User-independent queries live longest; keyword queries vary the most.
+        self.cache_enabled = True
+        self.response_cache = TTLCache(max_entries=512)
+        self.default_cache_ttl = 600
+        self.cache_ttls = {
+            "Movie cultural context": 3600,
+            "Cross-domain analysis": 3600,
+            "Similar profiles": 3600,
+            "Demographics-1": 1800,
+            "Demographics-2": 1800,
+            "Lifestyle-targeted brands": 1800,
+            "Keyword-targeted brands": 600,
+            "Artist cultural context": 900,
+            "Place cultural context": 900
+        }
+        
+        # Negative cache: param combinations that came back empty or were
+        # rejected as invalid are skipped for a short while so fallback chains
+        # move straight on. Only statuses that depend on the params qualify;
+        # auth errors and request timeouts say nothing about the query
+        self.negative_cache_enabled = True
+        self.negative_cache_statuses = {400, 404, 422}
+        self.negative_cache = TTLCache(max_entries=1024)
+        self.negative_cache_ttl = 120
+        self.negative_stores = 0
+        self.negative_hits = 0
+        
+        # Fallback chains are reordered per preference shape from observed outcomes
+        self.adaptive_ordering_enabled = True
+        self.approach_order = AdaptiveApproachOrder()
+        
+        # Single-flight coalescing of identical in-flight requests (per event
+        # loop: a task can only be awaited from the loop that runs it)
+        self.coalescing_enabled = True
+        self._in_flight: Dict[asyncio.AbstractEventLoop, Dict[str, Dict]] = {}
+        self.coalesced_calls = 0
+        
+        # Batch profile building: planned queries are deduplicated across users
+        self.batch_concurrency = 8
+        self.batch_profiles = 0
+        self.batch_planned_queries = 0
+        self.batch_unique_queries = 0
+        
+        # Optional on-disk store shared with the other workers and the dashboard
+        self.response_store: Optional[SQLiteResponseStore] = None
+        self.store_compaction_interval = 300
+        self._compaction_task: Optional[asyncio.Task] = None
+        if settings.qloo_response_store_path:
+            try:
+                self.response_store = SQLiteResponseStore(
+                    settings.qloo_response_store_path,
+                    max_bytes=settings.qloo_response_store_max_mb * 1024 * 1024
+                )
+                print(f"✅ Qloo response store enabled at {settings.qloo_response_store_path}")
+            except Exception as e:
+                print(f"⚠️ Qloo response store unavailable: {e}")
+        
+        # Connection pool tuning for the shared HTTP session
+        self.pool_limit = 100
+        self.pool_limit_per_host = 20
+        self.keepalive_timeout = 30
+        self.dns_cache_ttl = 300
+        # One pooled session per event loop (a session cannot cross loops);
+        # the per-loop maps are guarded by a thread lock
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._loop_state_lock = threading.Lock()
+        
         # Performance tracking
         self.api_call_count = 0
         self.successful_calls = 0
         self.failed_calls = 0
+        self.sessions_opened = 0
+
+    @property
+    def api_available(self) -> Optional[bool]:
+        """None until the first health probe, then False only while the circuit is open."""
+        if not self._api_checked and self.circuit_breaker.state == CircuitBreaker.CLOSED:
+            return None
+        return self.circuit_breaker.state != CircuitBreaker.OPEN
+
+    async def start(self) -> None:
+        """Open the pooled HTTP session and background jobs. Called from application startup."""
+        await self._get_session()
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._run_health_prober())
+        if self._global_context_task is None:
+            self._global_context_task = asyncio.create_task(self._run_global_context_refresher())
+        if self.response_store and self._compaction_task is None:
+            self._compaction_task = asyncio.create_task(
+                self.response_store.run_compaction(self.store_compaction_interval)
+            )
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session and response store and stop background jobs. Called from application shutdown."""
+        for task in (self._health_task, self._compaction_task, self._global_context_task):
+            if task is not None:
+                task.cancel()
+        self._health_task = None
+        self._compaction_task = None
+        self._global_context_task = None
+        await self.release_loop_session()
+        if self.response_store is not None:
+            await self.response_store.aclose()
+            self.response_store = None
+
+    async def release_loop_session(self) -> None:
+        """
+        Close the session owned by the running loop.
+        
+        Callers that drive the service through short-lived loops (the
+        dashboard's asyncio.run() calls) must await this before their loop
+        ends; a session cannot be closed cleanly once its loop is gone.
+        """
+        loop = asyncio.get_running_loop()
+        with self._loop_state_lock:
+            session = self._sessions.pop(loop, None)
+            self._in_flight.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+        self._drop_dead_loops()
+
+    def _drop_dead_loops(self) -> None:
+        """Forget sessions and in-flight maps of loops closed without release_loop_session()."""
+        with self._loop_state_lock:
+            dead = [loop for loop in {*self._sessions, *self._in_flight} if loop.is_closed()]
+            for loop in dead:
+                self._in_flight.pop(loop, None)
+                session = self._sessions.pop(loop, None)
+                if session is not None:
+                    print("⚠️ Dropping a Qloo session whose event loop closed without releasing it")
+                    session.detach()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the running loop's long-lived session, creating it on first use.
+        
+        A session is bound to the event loop it was created on, so each loop
+        gets its own; see release_loop_session() for short-lived loops.
+        """
+        loop = asyncio.get_running_loop()
+        with self._loop_state_lock:
+            session = self._sessions.get(loop)
+        if session is None or session.closed:
+            self._drop_dead_loops()
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_limit,
+                limit_per_host=self.pool_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True
+            )
+            session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+            with self._loop_state_lock:
+                self._sessions[loop] = session
+                self.sessions_opened += 1
+        return session
+
     async def get_similarity_score(self, entity1: str, entity2: str) -> float:
         """Get similarity between two entities (simulated for demo)"""
         # Real implementation would use:
@@ -64,26 +324,145 @@ class QlooService:
             CulturalProfile with real brand insights or enhanced sample data
         """
         
+        budget = CallBudget(self.profile_call_budget, self.profile_time_budget_ms)
+        # Scoped to this build: later calls in the same task must not inherit the
+        # deadline or draw from this profile's budget
+        deadline_token = _request_deadline.set(time.monotonic() + self.profile_deadline)
+        budget_token = _call_budget.set(budget)
         try:
             print("🔍 Creating enhanced cultural profile...")
 
             self._log_preferences_summary(preferences)
             
-            # Initialize API connection if needed
-            if self.api_available is None:
-                self.api_available = await self._test_api_connection()
-            
-            if self.api_available:
+            # Availability is kept current by the background health prober and the
+            # circuit breaker; unknown (no probe yet) is treated as available
+            if self.api_available is not False:
                 print("🔍 Using real Qloo API with enhanced intelligence...")
-                return await self._create_profile_with_enhanced_api(preferences)
+                profile = await self._create_profile_with_enhanced_api(preferences)
             else:
-                print("🔄 Using enhanced sample data with cultural intelligence...")
-                return self._create_enhanced_sample_profile(preferences)
+                print(f"🔄 Qloo circuit is {self.circuit_breaker.state} - using enhanced sample data with cultural intelligence...")
+                profile = self._create_enhanced_sample_profile(preferences)
                 
         except Exception as e:
             print(f"⚠️ Cultural profile creation error: {e}")
             self.failed_calls += 1
-            return self._create_enhanced_sample_profile(preferences)
+            profile = self._create_enhanced_sample_profile(preferences)
+        finally:
+            _call_budget.reset(budget_token)
+            _request_deadline.reset(deadline_token)
+        
+        return self._apply_call_accounting(profile, budget)
+    
+    def _apply_call_accounting(self, profile: Optional[CulturalProfile], budget: CallBudget) -> Optional[CulturalProfile]:
+        """Stamp the profile with the Qloo calls and request time its build consumed."""
+        
+        if budget.skipped_calls:
+            self.budget_exhausted_profiles += 1
+            print(f"💸 Qloo budget exhausted: {budget.skipped_calls} calls skipped "
+                  f"({budget.calls_used}/{budget.max_calls} calls, {budget.ms_used:.0f}/{budget.max_ms:.0f} ms)")
+        
+        if profile is not None:
+            profile.qloo_calls_used = budget.calls_used
+            profile.qloo_time_ms = round(budget.ms_used, 1)
+            profile.qloo_calls_skipped = budget.skipped_calls
+        return profile
+    
+    async def create_cultural_profiles(self, preferences_list: List[UserPreferences]) -> List[Optional[CulturalProfile]]:
+        """
+        Create cultural profiles for several users at once.
+        
+        The queries every profile would issue are planned up front and
+        deduplicated (the movie and cross-domain lookups are identical for every
+        user, demographic queries repeat per age group), then each unique query
+        is sent once with at most batch_concurrency requests in flight. Profiles
+        are assembled from those shared results; anything not prefetched (fallback
+        approaches, later artist pages) goes through the normal request path.
+        
+        Args:
+            preferences_list: One UserPreferences per user
+            
+        Returns:
+            Profiles in the same order as preferences_list
+        """
+        
+        if not preferences_list:
+            return []
+        
+        print(f"👥 Creating {len(preferences_list)} cultural profiles in batch...")
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        batch: Dict[str, Optional[Dict]] = {}
+        
+        if self.api_available is not False:
+            unique_queries: Dict[str, Tuple[Dict, str, Optional[str]]] = {}
+            planned = 0
+            for preferences in preferences_list:
+                for params, request_type, shape in self._plan_profile_queries(preferences):
+                    planned += 1
+                    unique_queries.setdefault(canonical_params_key(params), (params, request_type, shape))
+            
+            self.batch_planned_queries += planned
+            self.batch_unique_queries += len(unique_queries)
+            print(f"🗂️ Batch plan: {planned} queries, {len(unique_queries)} unique")
+            
+            async def prefetch(cache_key: str, params: Dict, request_type: str, shape: Optional[str]) -> None:
+                # Approach queries record their outcome here, once; profiles only replay it
+                async with semaphore:
+                    try:
+                        batch[cache_key] = await self._run_approach(params, request_type, shape)
+                    except Exception as e:
+                        print(f"⚠️ Batch prefetch error ({request_type}): {e}")
+            
+            await asyncio.gather(*(
+                prefetch(cache_key, params, request_type, shape)
+                for cache_key, (params, request_type, shape) in unique_queries.items()
+            ))
+        
+        # Tasks created below copy the current context, so every profile sees the batch
+        token = _batch_results.set(batch)
+        try:
+            async def assemble(preferences: UserPreferences) -> Optional[CulturalProfile]:
+                async with semaphore:
+                    return await self.create_cultural_profile(preferences)
+            
+            profiles = await asyncio.gather(*(assemble(preferences) for preferences in preferences_list))
+        finally:
+            _batch_results.reset(token)
+        
+        self.batch_profiles += len(profiles)
+        return list(profiles)
+    
+    def _plan_profile_queries(self, preferences: UserPreferences) -> List[Tuple[Dict, str, Optional[str]]]:
+        """
+        First-choice queries a profile build for these preferences sends.
+        
+        Entries are (params, request_type, shape); shape is set for fallback
+        approaches (whose outcomes feed adaptive ordering) and None otherwise.
+        """
+        
+        planned = []
+        shape = self._preference_shape(preferences)
+        for approaches in (self._preference_brand_approaches(preferences),
+                           self._demographic_approaches(preferences)):
+            approaches = self._ordered_approaches(shape, approaches, count_run=False)
+            if approaches:
+                params, request_type = approaches[0]
+                planned.append((params, request_type, shape))
+        
+        if self._global_context_field("movies") is None:
+            planned.append((self._movie_context_params(), "Movie cultural context", None))
+        if preferences.music_genres:
+            planned.append(({
+                **self._artist_context_params(preferences.music_genres),
+                "take": self.artist_context_page_size,
+                "page": 1
+            }, "Artist cultural context", None))
+        if preferences.dining_preferences:
+            planned.append((self._place_context_params(preferences.dining_preferences),
+                            "Place cultural context", None))
+        if self._global_context_field("cross_domain") is None:
+            planned.append((self._cross_domain_params(), "Cross-domain analysis", None))
+        
+        return planned
     
     async def _create_profile_with_enhanced_api(self, preferences: UserPreferences) -> CulturalProfile:
         """
@@ -99,26 +478,19 @@ class QlooService:
         try:
             print("🎯 Executing enhanced multi-method API strategy...")
             
-            # Method 1: Get preference-targeted brand insights
-            brand_insights = await self._get_preference_targeted_brands(preferences)
-            
-            # Method 2: Get demographic-based insights  
-            demographic_insights = await self._get_demographic_insights(preferences)
-            
-            # Method 3: Get cultural context
-
-            cultural_context = await self._get_enhanced_cultural_context(preferences)
-
-            # Method 4: Get cross-domain relationships
-            cross_domain_data = await self._get_cross_domain_relationships(preferences)
-
-
-            # Combine all insights for comprehensive analysis
-            combined_insights = self._combine_insights(
-                brand_insights, demographic_insights, cultural_context, cross_domain_data
-            )
+            # The four methods are independent, so run them concurrently (each
+            # with its own timeout) and merge results as they arrive
+            branches = {
+                asyncio.ensure_future(self._run_with_timeout(coro, method_name)): method_name
+                for method_name, coro in [
+                    ("preference_targeted_brands", self._get_preference_targeted_brands(preferences)),
+                    ("demographic_insights", self._get_demographic_insights(preferences)),
+                    ("cultural_context", self._get_enhanced_cultural_context(preferences)),
+                    ("cross_domain_analysis", self._get_cross_domain_relationships(preferences))
+                ]
+            }
+            combined_insights = await self._combine_as_completed(branches)
 
-            
             if self._has_meaningful_combined_data(combined_insights):
                 print("✅ Enhanced Qloo insights successfully integrated!")
                 return self._parse_enhanced_insights(combined_insights, preferences)
@@ -131,85 +503,270 @@ class QlooService:
             self.failed_calls += 1
             return self._create_enhanced_sample_profile(preferences)
     
+    async def _combine_as_completed(self, branches: Dict[asyncio.Task, str]) -> Dict:
+        """
+        Merge branch results into an InsightCombiner as each branch finishes.
+        
+        With early_exit_enabled, stop waiting (and cancel the remaining
+        branches) once the data is "good enough": at least
+        early_exit_min_entities entities including early_exit_min_brands
+        brands, or profile_latency_budget seconds have passed and
+        _has_meaningful_combined_data would already be satisfied.
+        """
+        
+        combiner = self._new_insight_combiner()
+        pending = set(branches)
+        started = time.monotonic()
+        
+        try:
+            while pending:
+                remaining = self.profile_latency_budget - (time.monotonic() - started)
+                timeout = remaining if self.early_exit_enabled and remaining > 0 else None
+                
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    result = None if task.cancelled() or task.exception() else task.result()
+                    combiner.add(branches[task], result)
+                
+                if not pending or not self.early_exit_enabled:
+                    continue
+                
+                if (combiner.total_entities >= self.early_exit_min_entities
+                        and combiner.brand_count >= self.early_exit_min_brands):
+                    print(f"⚡ Early exit: {combiner.total_entities} entities / {combiner.brand_count} brands "
+                          f"is rich enough, skipping {len(pending)} pending method(s)")
+                    self.early_exits_richness += 1
+                    break
+                
+                budget_spent = time.monotonic() - started >= self.profile_latency_budget
+                if budget_spent and self._meets_minimum_data(combiner.total_entities, combiner.brand_count):
+                    print(f"⏱️ Early exit: {self.profile_latency_budget}s latency budget reached, "
+                          f"skipping {len(pending)} pending method(s)")
+                    self.early_exits_budget += 1
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+                self.cancelled_branches += 1
+        
+        return combiner.result()
+    
+    async def _run_with_timeout(self, coro, method_name: str) -> Optional[Dict]:
+        """Await one profile-building method, giving up after its configured timeout."""
+        
+        timeout = self.method_timeouts.get(method_name, self.request_timeout)
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"⏰ {method_name} exceeded its {timeout}s timeout")
+            return None
+    
     async def _get_preference_targeted_brands(self, preferences: UserPreferences) -> Optional[Dict]:
         """Get brand insights targeted to specific user preferences."""
         
         try:
             print("🎯 Method 1: Preference-targeted brand discovery...")
             
-            # Extract relevant lifestyle tags from preferences
-            lifestyle_tags = self._extract_lifestyle_tags(preferences)
-            
-            if lifestyle_tags:
-                # Try with lifestyle tags first
-                params = {
-                    "filter.type": "urn:entity:brand",
-                    "filter.tags": ",".join(lifestyle_tags),
-                    "filter.popularity.min": 0.2,  # Include emerging brands
-                    "take": 12
-                }
-                
-                result = await self._make_enhanced_request(params, "Lifestyle-targeted brands")
-                if result:
-                    return result
-            
-            # Fallback: Use preference keywords as signals
-            preference_keywords = self._extract_preference_keywords(preferences)
-            if preference_keywords:
-                params = {
-                    "filter.type": "urn:entity:brand",
-                    "signal.interests.keywords": preference_keywords,
-                    "filter.popularity.min": 0.3,
-                    "take": 10
-                }
-                
-                return await self._make_enhanced_request(params, "Keyword-targeted brands")
-            
-            return None
+            shape = self._preference_shape(preferences)
+            return await self._run_fallback_chain(
+                self._ordered_approaches(shape, self._preference_brand_approaches(preferences)), shape
+            )
                     
         except Exception as e:
             print(f"⚠️ Preference-targeted brands error: {e}")
             return None
     
+    def _preference_brand_approaches(self, preferences: UserPreferences) -> List[Tuple[Dict, str]]:
+        """Ordered (params, request_type) approaches for preference-targeted brands."""
+        
+        approaches = []
+        
+        # Try with lifestyle tags first
+        lifestyle_tags = self._extract_lifestyle_tags(preferences)
+        if lifestyle_tags:
+            approaches.append(({
+                "filter.type": "urn:entity:brand",
+                "filter.tags": ",".join(lifestyle_tags),
+                "filter.popularity.min": 0.2,  # Include emerging brands
+                "take": 12
+            }, "Lifestyle-targeted brands"))
+        
+        # Fallback: Use preference keywords as signals
+        preference_keywords = self._extract_preference_keywords(preferences)
+        if preference_keywords:
+            approaches.append(({
+                "filter.type": "urn:entity:brand",
+                "signal.interests.keywords": preference_keywords,
+                "filter.popularity.min": 0.3,
+                "take": 10
+            }, "Keyword-targeted brands"))
+        
+        return approaches
+    
     async def _get_demographic_insights(self, preferences: UserPreferences) -> Optional[Dict]:
         """Get insights based on demographic and audience targeting."""
         
         try:
             print("🎯 Method 2: Demographic-based brand insights...")
             
-            # Determine optimal age group and audience
-            age_group = self._determine_optimal_age_group(preferences)
-            audience = self._determine_target_audience(preferences)
-            
-            approaches = [
-                {
-                    "filter.type": "urn:entity:brand",
-                    "filter.popularity.min": 0.3,
-                    "signal.demographics.age": age_group,
-                    "signal.demographics.audiences": audience,
-                    "filter.location.query": "United States",
-                    "take": 10
-                },
-                {
-                    "filter.type": "urn:entity:brand", 
-                    "signal.demographics.age": age_group,
-                    "filter.popularity.min": 0.25,
-                    "take": 8
-                }
-            ]
-            
-            for i, params in enumerate(approaches, 1):
-                print(f"   🔍 Demographic approach {i}...")
-                result = await self._make_enhanced_request(params, f"Demographics-{i}")
-                if result:
-                    return result
-            
-            return None
+            shape = self._preference_shape(preferences)
+            return await self._run_fallback_chain(
+                self._ordered_approaches(shape, self._demographic_approaches(preferences)), shape
+            )
                     
         except Exception as e:
             print(f"⚠️ Demographic insights error: {e}")
             return None
     
+    def _demographic_approaches(self, preferences: UserPreferences) -> List[Tuple[Dict, str]]:
+        """Ordered (params, request_type) approaches for demographic insights."""
+        
+        # Determine optimal age group and audience
+        age_group = self._determine_optimal_age_group(preferences)
+        audience = self._determine_target_audience(preferences)
+        
+        return [
+            ({
+                "filter.type": "urn:entity:brand",
+                "filter.popularity.min": 0.3,
+                "signal.demographics.age": age_group,
+                "signal.demographics.audiences": audience,
+                "filter.location.query": "United States",
+                "take": 10
+            }, "Demographics-1"),
+            ({
+                "filter.type": "urn:entity:brand", 
+                "signal.demographics.age": age_group,
+                "filter.popularity.min": 0.25,
+                "take": 8
+            }, "Demographics-2")
+        ]
+    
+    def _preference_shape(self, preferences: UserPreferences) -> str:
+        """Coarse key grouping users whose fallback chains behave alike."""
+        
+        filled = [
+            name for name, values in (
+                ("music", preferences.music_genres),
+                ("dining", preferences.dining_preferences),
+                ("fashion", preferences.fashion_styles),
+                ("entertainment", preferences.entertainment_types),
+                ("lifestyle", preferences.lifestyle_choices)
+            ) if values
+        ]
+        return (f"{self._determine_optimal_age_group(preferences)}/"
+                f"{self._determine_target_audience(preferences)}/{'+'.join(filled) or 'none'}")
+    
+    def _ordered_approaches(self, shape: str, approaches: List[Tuple[Dict, str]],
+                            count_run: bool = True) -> List[Tuple[Dict, str]]:
+        """Apply the learned ordering (and skips) for this preference shape."""
+        
+        if not self.adaptive_ordering_enabled:
+            return approaches
+        
+        ordered = self.approach_order.order(shape, approaches, count_run=count_run)
+        if count_run and [t for _, t in ordered] != [t for _, t in approaches]:
+            print(f"   🧭 Adaptive order for {shape}: {' → '.join(t for _, t in ordered)}")
+        return ordered
+    
+    async def _run_approach(self, params: Dict, request_type: str, shape: Optional[str]) -> Optional[Dict]:
+        """Run one fallback approach and record its outcome for adaptive ordering."""
+        
+        started = time.monotonic()
+        result, fresh = await self._request_insights(params, request_type)
+        if not fresh:
+            # A replayed answer (batch, cache, joined flight) was already recorded
+            # when it was fetched; a skip, timeout or 5xx says nothing about the approach
+            return result
+        if shape is not None and self.adaptive_ordering_enabled:
+            self.approach_order.record(
+                shape, request_type, self._has_entities(result), (time.monotonic() - started) * 1000
+            )
+        return result
+    
+    async def _run_fallback_chain(self, approaches: List[Tuple[Dict, str]],
+                                  shape: Optional[str] = None) -> Optional[Dict]:
+        """
+        Run an ordered list of (params, request_type) approaches until one returns entities.
+        
+        Without hedging each approach waits for the previous one to fail. With
+        hedging the next approach is also started once the current one has been
+        outstanding for hedge_delay seconds; the first result with entities wins
+        and the rest are cancelled. Outcomes are recorded under `shape` for
+        adaptive ordering; cancelled approaches are not recorded.
+        """
+        
+        if not approaches:
+            return None
+        
+        if not self.hedging_enabled or len(approaches) == 1:
+            for params, request_type in approaches:
+                print(f"   🔍 {request_type} approach...")
+                result = await self._run_approach(params, request_type, shape)
+                if self._has_entities(result):
+                    return result
+            return None
+        
+        return await self._run_hedged_chain(approaches, shape)
+    
+    async def _run_hedged_chain(self, approaches: List[Tuple[Dict, str]],
+                                shape: Optional[str] = None) -> Optional[Dict]:
+        """Hedged variant of _run_fallback_chain; see its docstring."""
+        
+        self.hedged_chains += 1
+        pending: Dict[asyncio.Task, int] = {}
+        hedged_indexes = set()
+        next_index = 0
+        
+        def launch(as_hedge: bool) -> None:
+            nonlocal next_index
+            params, request_type = approaches[next_index]
+            print(f"   🔍 {request_type} approach{' (hedge)' if as_hedge else ''}...")
+            task = asyncio.ensure_future(self._run_approach(params, request_type, shape))
+            pending[task] = next_index
+            if as_hedge:
+                hedged_indexes.add(next_index)
+                self.hedges_fired += 1
+            next_index += 1
+        
+        launch(as_hedge=False)
+        try:
+            while pending:
+                has_more = next_index < len(approaches)
+                done, _ = await asyncio.wait(
+                    pending.keys(),
+                    timeout=self.hedge_delay if has_more else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                if not done:
+                    # Current approaches are slow; fire the next one alongside them
+                    launch(as_hedge=True)
+                    continue
+                
+                for task in done:
+                    index = pending.pop(task)
+                    result = None if task.exception() else task.result()
+                    if self._has_entities(result):
+                        if index in hedged_indexes:
+                            self.hedge_wins += 1
+                        return result
+                
+                # Everything in flight came back empty; fall through immediately
+                if not pending and next_index < len(approaches):
+                    launch(as_hedge=False)
+            
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def _has_entities(self, result: Optional[Dict]) -> bool:
+        """Check whether an insights response contains at least one entity."""
+        
+        return bool(result and result.get("results", {}).get("entities"))
+    
     async def _get_enhanced_cultural_context(self, preferences: UserPreferences) -> Optional[Dict]:
         """Get enhanced cultural context from multiple entity types."""
         
@@ -218,22 +775,27 @@ class QlooService:
             
             cultural_data = {}
             
-            # Get movie context (proven to work)
-            movie_context = await self._get_movie_cultural_context()
-            if movie_context:
-                cultural_data["movies"] = movie_context
-            
-            # Try to get artist context for music preferences
+            # Movie context (proven to work) plus artist/place context when the
+            # user gave music or dining preferences, all issued in one round trip
+            lookups = {"movies": self._get_movie_cultural_context()}
             if preferences.music_genres:
-                artist_context = await self._get_artist_cultural_context(preferences.music_genres)
-                if artist_context:
-                    cultural_data["artists"] = artist_context
-            
-            # Try to get place context for dining preferences
+                lookups["artists"] = self._get_artist_cultural_context(preferences.music_genres)
             if preferences.dining_preferences:
-                place_context = await self._get_place_cultural_context(preferences.dining_preferences)
-                if place_context:
-                    cultural_data["places"] = place_context
+                lookups["places"] = self._get_place_cultural_context(preferences.dining_preferences)
+            
+            results = await asyncio.gather(
+                *(asyncio.wait_for(lookup, timeout=self.context_lookup_timeout) for lookup in lookups.values()),
+                return_exceptions=True
+            )
+            
+            # Keep whatever succeeded; a failed or slow lookup only drops its own key
+            for key, result in zip(lookups, results):
+                if isinstance(result, asyncio.TimeoutError):
+                    print(f"⏰ Cultural {key} lookup timed out")
+                elif isinstance(result, Exception):
+                    print(f"⚠️ Cultural {key} lookup error: {result}")
+                elif result:
+                    cultural_data[key] = result
             
             return cultural_data if cultural_data else None
                     
@@ -251,289 +813,423 @@ class QlooService:
             # music preferences and fashion brands, lifestyle and dining, etc.
             # For now, we'll do a simplified cross-domain analysis
             
-            cross_domain_params = {
-                "filter.type": "urn:entity:brand",
-                "filter.popularity.min": 0.4,  # Focus on well-connected brands
-                "signal.demographics.audiences": "cultural_influencers",
-                "take": 6
-            }
+            cached = self._global_context_field("cross_domain")
+            if cached is not None:
+                return cached
             
-            return await self._make_enhanced_request(cross_domain_params, "Cross-domain analysis")
+            return await self._make_enhanced_request(self._cross_domain_params(), "Cross-domain analysis")
                     
         except Exception as e:
             print(f"⚠️ Cross-domain analysis error: {e}")
             return None
     
+    def _cross_domain_params(self) -> Dict:
+        return {
+            "filter.type": "urn:entity:brand",
+            "filter.popularity.min": 0.4,  # Focus on well-connected brands
+            "signal.demographics.audiences": "cultural_influencers",
+            "take": 6
+        }
+    
     async def _get_movie_cultural_context(self) -> Optional[Dict]:
         """Get cultural context from movie entities (proven working method)."""
         
-        params = {
+        cached = self._global_context_field("movies")
+        if cached is not None:
+            return cached
+        
+        return await self._make_enhanced_request(self._movie_context_params(), "Movie cultural context")
+    
+    def _movie_context_params(self) -> Dict:
+        return {
             "filter.type": "urn:entity:movie",
             "filter.tags": "urn:tag:genre:media:comedy",
             "take": 6
         }
-        
-        return await self._make_enhanced_request(params, "Movie cultural context")
     
     async def _get_artist_cultural_context(self, music_genres: List[str]) -> Optional[Dict]:
         """Get cultural context from music artists."""
         
+        # Pull pages lazily until we have artist_context_depth artists
+        artists = await self.collect_entities(
+            self._artist_context_params(music_genres), "Artist cultural context",
+            want=self.artist_context_depth, page_size=self.artist_context_page_size
+        )
+        return {"results": {"entities": artists}} if artists else None
+    
+    def _artist_context_params(self, music_genres: List[str]) -> Dict:
         # Try to get artist insights based on music preferences
-        music_keywords = ",".join(music_genres[:3])
-        
-        params = {
+        return {
             "filter.type": "urn:entity:artist",
-            "signal.interests.keywords": music_keywords,
-            "filter.popularity.min": 0.2,
-            "take": 5
+            "signal.interests.keywords": ",".join(music_genres[:3]),
+            "filter.popularity.min": 0.2
         }
-        
-        return await self._make_enhanced_request(params, "Artist cultural context")
     
     async def _get_place_cultural_context(self, dining_preferences: List[str]) -> Optional[Dict]:
         """Get cultural context from places/restaurants."""
         
-        dining_keywords = ",".join(dining_preferences[:3])
-        
-        params = {
+        return await self._make_enhanced_request(
+            self._place_context_params(dining_preferences), "Place cultural context"
+        )
+    
+    def _place_context_params(self, dining_preferences: List[str]) -> Dict:
+        return {
             "filter.type": "urn:entity:place",
-            "signal.interests.keywords": dining_keywords,
+            "signal.interests.keywords": ",".join(dining_preferences[:3]),
             "filter.location.query": "New York",  # Focus on major cultural center
             "take": 4
         }
+    
+    async def iter_insight_pages(self, params: Dict, request_type: str,
+                                 page_size: int = 10, max_pages: Optional[int] = None) -> AsyncIterator[List[Dict]]:
+        """
+        Async generator over /v2/insights result pages.
+        
+        Each page is requested only when the consumer asks for the next one, and
+        iteration stops at the first empty or short page (or after max_pages).
+        Pages go through _make_enhanced_request, so they are cached and
+        coalesced like any other query.
+        
+        Args:
+            params: API request parameters (any "take"/"page" values are overridden)
+            request_type: Description of request for logging and cache TTL
+            page_size: Entities per page
+            max_pages: Upper bound on pages fetched (defaults to max_insight_pages)
+            
+        Yields:
+            Lists of raw entity dicts, one list per page
+        """
         
-        return await self._make_enhanced_request(params, "Place cultural context")
+        for page in range(1, (max_pages or self.max_insight_pages) + 1):
+            print(f"   📄 {request_type}: fetching page {page}")
+            data = await self._make_enhanced_request({**params, "take": page_size, "page": page}, request_type)
+            entities = data.get("results", {}).get("entities", []) if data else []
+            if not entities:
+                return
+            
+            yield entities
+            
+            if len(entities) < page_size:
+                return
+    
+    async def collect_entities(self, params: Dict, request_type: str, want: int,
+                               category: Optional[str] = None, page_size: int = 10,
+                               max_pages: Optional[int] = None) -> List[Dict]:
+        """
+        Consume insight pages until `want` entities (optionally of one category) are collected.
+        
+        Later pages are never requested once enough entities have been found.
+        """
+        
+        collected = []
+        pages = self.iter_insight_pages(params, request_type, page_size=page_size, max_pages=max_pages)
+        try:
+            async for entities in pages:
+                for raw in entities:
+                    if category is None or self._classify_entity_by_name(raw) == category:
+                        collected.append(raw)
+                if len(collected) >= want:
+                    break
+        finally:
+            await pages.aclose()
+        
+        return collected[:want]
     
     async def _make_enhanced_request(self, params: Dict, request_type: str) -> Optional[Dict]:
         """
-        Make enhanced API request with retry logic and detailed logging.
+        Make enhanced API request, served from the response cache when possible.
+        
+        Identical requests already in flight are coalesced: later callers await
+        the first caller's result instead of sending a duplicate.
         
         Args:
             params: API request parameters
-            request_type: Description of request for logging
+            request_type: Description of request for logging (also selects the cache TTL)
             
         Returns:
             API response data or None if failed
         """
         
+        result, _ = await self._request_insights(params, request_type)
+        return result
+    
+    async def _request_insights(self, params: Dict, request_type: str) -> Tuple[Optional[Dict], bool]:
+        """
+        _make_enhanced_request, also reporting whether this call got a fresh answer.
+        
+        The flag is True only when this call itself received a definitive HTTP
+        answer from Qloo: a 200 (with or without entities) or a non-retryable
+        4xx. Replays (batch results, either cache tier, a joined in-flight
+        request) and calls that got no answer (negative-cache hit, circuit
+        open, budget or rate limit, timeouts, 5xx) report False.
+        """
+        
+        cache_key = canonical_params_key(params)
+        
+        batch = _batch_results.get()
+        if batch is not None and cache_key in batch:
+            return batch[cache_key], False
+        
+        if self.negative_cache_enabled:
+            reason = self.negative_cache.get(cache_key)
+            if reason is not None:
+                self.negative_hits += 1
+                print(f"🚫 {request_type} skipped: same params recently returned {reason}")
+                return None, False
+        
+        if self.cache_enabled:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                print(f"⚡ {request_type} served from cache")
+                return cached, False
+        
+        if not self.coalescing_enabled:
+            return await self._load_insights(cache_key, params, request_type)
+        
+        return await self._coalesced_load(cache_key, params, request_type)
+    
+    async def _coalesced_load(self, cache_key: str, params: Dict, request_type: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Single-flight wrapper around _load_insights keyed by canonical params.
+        
+        The shared fetch serves several profiles, so it runs outside any one
+        profile's call budget and deadline; instead every waiter is checked
+        against and charged to its own budget here (one call plus its wait,
+        refunded if the flight never sent a request).
+        """
+        
+        budget = _call_budget.get()
+        if budget is not None and not budget.try_acquire():
+            print(f"💸 {request_type} skipped: profile call budget exhausted")
+            self.budget_skipped_calls += 1
+            return None, False
+        started = time.monotonic()
+        
+        # Only this loop's thread touches its own map
+        with self._loop_state_lock:
+            in_flight = self._in_flight.setdefault(asyncio.get_running_loop(), {})
+        flight = in_flight.get(cache_key)
+        leader = flight is None
+        
+        if leader:
+            # Unlimited budget used as a meter of the flight's own HTTP attempts
+            usage = CallBudget(max_calls=math.inf, max_ms=math.inf)
+            task = asyncio.ensure_future(self._load_shared_insights(cache_key, params, request_type, usage))
+            flight = {"task": task, "waiters": 0, "usage": usage}
+            in_flight[cache_key] = flight
+            task.add_done_callback(
+                lambda done, key=cache_key: in_flight.pop(key, None)
+                if in_flight.get(key, {}).get("task") is done else None
+            )
+        else:
+            self.coalesced_calls += 1
+            print(f"🔗 {request_type} joined an identical in-flight request")
+        
+        # The shared task only gets cancelled once every waiter has given up,
+        # so a cancelled hedge or timed-out branch cannot fail the other callers
+        flight["waiters"] += 1
+        try:
+            result, fresh = await asyncio.shield(flight["task"])
+            # Only the caller that started the flight counts it as its own answer
+            return result, fresh and leader
+        finally:
+            if budget is not None:
+                if flight["task"].done() and flight["usage"].calls_used == 0:
+                    budget.refund()
+                budget.release(started)
+            flight["waiters"] -= 1
+            if flight["waiters"] == 0 and not flight["task"].done():
+                flight["task"].cancel()
+    
+    async def _load_shared_insights(self, cache_key: str, params: Dict, request_type: str,
+                                    usage: CallBudget) -> Tuple[Optional[Dict], bool]:
+        """_load_insights for a coalesced flight, detached from the starting caller's budget and deadline."""
+        
+        # The task runs in a copy of the first caller's context; these sets stay in that copy
+        _call_budget.set(usage)
+        _request_deadline.set(None)
+        return await self._load_insights(cache_key, params, request_type)
+    
+    async def _load_insights(self, cache_key: str, params: Dict, request_type: str) -> Tuple[Optional[Dict], bool]:
+        """Read through the shared response store to the API and populate both cache tiers."""
+        
+        if not self.cache_enabled:
+            return await self._fetch_insights(params, request_type)
+        
+        ttl = self.cache_ttls.get(request_type, self.default_cache_ttl)
+        
+        if self.response_store:
+            stored = await self.response_store.aget(cache_key)
+            if stored is not None:
+                data, seconds_left = stored
+                print(f"⚡ {request_type} served from shared response store")
+                self.response_cache.set(cache_key, data, min(ttl, seconds_left))
+                return data, False
+        
+        result, fresh = await self._fetch_insights(params, request_type)
+        if result:
+            self.response_cache.set(cache_key, result, ttl)
+            if self.response_store:
+                await self.response_store.aset(cache_key, result, ttl)
+        return result, fresh
+    
+    async def _fetch_insights(self, params: Dict, request_type: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Call /v2/insights with circuit breaking, backoff-based retries and detailed logging.
+        
+        Returns the data (or None) and whether an HTTP attempt got a
+        definitive answer (a 200, or a non-retryable 4xx).
+        """
+        
         self.api_call_count += 1
+        answered = False
         
         for attempt in range(self.max_retries + 1):
+            if not self.circuit_breaker.allow_request():
+                print(f"⛔ {request_type} skipped: Qloo circuit is {self.circuit_breaker.state}")
+                self.short_circuited_calls += 1
+                break
+            
+            budget = _call_budget.get()
+            if budget is not None and not budget.try_acquire():
+                print(f"💸 {request_type} skipped: profile call budget exhausted")
+                self.budget_skipped_calls += 1
+                break
+            
+            if not await self._acquire_rate_limit_token():
+                print(f"⏳ {request_type} skipped: rate limit queue exceeds the request deadline")
+                self.rate_limited_calls += 1
+                if budget is not None:
+                    # Nothing was sent, so the attempt doesn't count against the profile
+                    budget.refund()
+                break
+            
+            retry_after = None
+            attempt_started = time.monotonic()
             try:
                 if attempt > 0:
                     print(f"   🔄 Retry {attempt} for {request_type}...")
                 
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        f"{self.base_url}/v2/insights",
-                        params=params,
-                        headers=self.headers,
-                        timeout=self.request_timeout
-                    ) as response:
+                session = await self._get_session()
+                async with session.get(
+                    f"{self.base_url}/v2/insights",
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+                ) as response:
+                    
+                    if response.status == 200:
+                        self.circuit_breaker.record_success()
+                        data = await response.json()
+                        entities = data.get("results", {}).get("entities", [])
                         
-                        if response.status == 200:
-                            data = await response.json()
-                            entities = data.get("results", {}).get("entities", [])
-                            
-                            if entities:
-                                print(f"✅ {request_type} SUCCESS: Found {len(entities)} entities")
-                                self.successful_calls += 1
-                                return data
-                            else:
-                                print(f"⚠️ {request_type}: API success but 0 entities returned")
-                                return None
+                        if entities:
+                            print(f"✅ {request_type} SUCCESS: Found {len(entities)} entities")
+                            self.successful_calls += 1
+                            return data, True
                         else:
-                            error_text = await response.text()
-                            print(f"⚠️ {request_type} failed ({response.status}): {error_text[:100]}...")
-                            
-                            # Don't retry on client errors (400-499)
-                            if 400 <= response.status < 500:
-                                break
+                            print(f"⚠️ {request_type}: API success but 0 entities returned")
+                            self._remember_negative(params, "0 entities")
+                            return None, True
+                    else:
+                        error_text = await response.text()
+                        print(f"⚠️ {request_type} failed ({response.status}): {error_text[:100]}...")
+                        
+                        if response.status in (408, 429) or response.status >= 500:
+                            self.circuit_breaker.record_failure(timeout=response.status == 408)
+                            retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+                        elif response.status in (401, 403):
+                            # Key or permission problem: a failure, but retrying won't fix it
+                            self.circuit_breaker.record_failure()
+                            break
+                        else:
+                            # Other client errors won't improve on retry,
+                            # and they prove the API itself is reachable
+                            self.circuit_breaker.record_success()
+                            if response.status in self.negative_cache_statuses:
+                                self._remember_negative(params, f"HTTP {response.status}")
+                            answered = True
+                            break
                                 
             except asyncio.TimeoutError:
                 print(f"⏰ {request_type} timeout (attempt {attempt + 1})")
+                self.circuit_breaker.record_failure(timeout=True)
             except Exception as e:
                 print(f"⚠️ {request_type} error (attempt {attempt + 1}): {e}")
+                self.circuit_breaker.record_failure()
+            finally:
+                if budget is not None:
+                    budget.release(attempt_started)
+            
+            if attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, retry_after)
+                if delay is None:
+                    print(f"   ⏳ {request_type}: Retry-After exceeds {self.backoff_max}s, giving up")
+                    break
+                print(f"   ⏳ Backing off {delay:.2f}s before retrying {request_type}")
+                await asyncio.sleep(delay)
         
         self.failed_calls += 1
-        return None
-    
-    def _combine_insights(self, *insights: Optional[Dict]) -> Dict:
-        """Combine multiple insight sources into unified data structure."""
-        
-        print("🔍 ENTITY COMBINATION DEBUG:")
-        input_insights_debug = []
-        for i, insight in enumerate(insights):
-            if insight:
-                if isinstance(insight, dict) and "results" in insight:
-                    entity_count = len(insight.get("results", {}).get("entities", []))
-                    input_insights_debug.append(f"Input{i+1}: {entity_count} entities")
-                else:
-                    context_keys = list(insight.keys()) if isinstance(insight, dict) else ["unknown"]
-                    input_insights_debug.append(f"Input{i+1}: {context_keys} context")
-            else:
-                input_insights_debug.append(f"Input{i+1}: None")
-        
-        print(f"   📥 Raw inputs: {' | '.join(input_insights_debug)}")
-        
-        combined = {
-            "brand_entities": [],
-            "movie_entities": [],
-            "artist_entities": [],
-            "place_entities": [],
-            "total_entities": 0,
-            "data_sources": [],
-            "entities": [],  # This is critical for consolidation
-            "debug_info": {
-                "combination_timestamp": datetime.now().isoformat(),
-                "input_sources": len([i for i in insights if i is not None]),
-                "entity_breakdown": {}
-            }
-        }
-        
-        method_names = [
-            "preference_targeted_brands",
-            "demographic_insights", 
-            "movie_context",
-            "artist_context",
-            "place_context",
-            "cross_domain_analysis"
-        ]
+        return None, answered
+    
+    def _remember_negative(self, params: Dict, reason: str) -> None:
+        """Record a deterministic miss (empty result or a params-related 4xx) for these params."""
         
-        method_index = 0
-        processing_log = []
+        if not self.negative_cache_enabled:
+            return
+        self.negative_cache.set(canonical_params_key(params), reason, self.negative_cache_ttl)
+        self.negative_stores += 1
+    
+    async def _acquire_rate_limit_token(self) -> bool:
+        """Wait for a rate-limit token, but never past the current request's deadline."""
+        
+        deadline = time.monotonic() + self.request_timeout
+        request_deadline = _request_deadline.get()
+        if request_deadline is not None:
+            deadline = min(deadline, request_deadline)
+        return await self.rate_limiter.acquire(deadline=deadline)
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """
+        Delay before the next retry: the server's Retry-After when given,
+        otherwise full-jitter exponential backoff. Returns None when the server
+        asks us to wait longer than backoff_max.
+        """
         
-        for insight in insights:
-            if insight:
-                if isinstance(insight, dict) and "results" in insight:
-                    # Standard insights response
-                    entities = insight.get("results", {}).get("entities", [])
-                    entity_count = len(entities)
-                    
-                    entity_type_counts = {"brand": 0, "movie": 0, "artist": 0, "place": 0, "other": 0}
-                    
-                    # FIXED: Process each entity with proper scope
-                    for entity in entities:
-                        try:
-                            entity_type = entity.get("type", "")
-                            entity_name = entity.get("name", "Unknown")
-                            
-                            # NEW: Use name-based classification since all types are "urn:entity"
-                            classification = self._classify_entity_by_name(entity)
-                            
-                            if classification == "brand":
-                                combined["brand_entities"].append(entity)
-                                entity_type_counts["brand"] += 1
-                            elif classification == "movie":
-                                combined["movie_entities"].append(entity)
-                                entity_type_counts["movie"] += 1
-                            elif classification == "artist":
-                                combined["artist_entities"].append(entity)
-                                entity_type_counts["artist"] += 1
-                            elif classification == "place":
-                                combined["place_entities"].append(entity)
-                                entity_type_counts["place"] += 1
-                            else:
-                                entity_type_counts["other"] += 1
-                                print(f"      ⚠️ Unclassified entity: {entity_name} (type: {entity_type})")
-                            
-                            # Add to main entities list
-                            combined["entities"].append(entity)
-                            
-                        except Exception as e:
-                            print(f"⚠️ Error processing entity {entity_name}: {e}")
-                            continue
-                    
-                    method_name = method_names[method_index] if method_index < len(method_names) else f"method_{method_index+1}"
-                    processing_log.append(f"{method_name}: {entity_type_counts}")
-                    combined["debug_info"]["entity_breakdown"][method_name] = entity_type_counts
-                    combined["data_sources"].append(f"{method_name}_{entity_count}_entities")
-                    method_index += 1
-                    
-                elif isinstance(insight, dict):
-                    # Cultural context with multiple entity types
-                    for key, value in insight.items():
-                        if key in ["movies", "artists", "places"] and value:
-                            entities = value.get("results", {}).get("entities", [])
-                            entity_count = len(entities)
-                            
-                            for entity in entities:
-                                try:
-                                    combined[f"{key[:-1]}_entities"].append(entity)
-                                    combined["entities"].append(entity)
-                                except Exception as e:
-                                    print(f"⚠️ Error processing cultural entity: {e}")
-                                    continue
-                            
-                            context_method = f"cultural_{key}"
-                            processing_log.append(f"{context_method}: {entity_count} entities")
-                            combined["debug_info"]["entity_breakdown"][context_method] = {key[:-1]: entity_count}
-                            combined["data_sources"].append(f"cultural_{key}_{entity_count}_entities")
-        
-        # CRITICAL: Consolidate entity counts
-        print("🔍 ENTITY CONSOLIDATION DEBUG:")
-        all_entities = combined["entities"]
-        entity_categories = ["brand_entities", "movie_entities", "artist_entities", "place_entities"]
-        
-        for category in entity_categories:
-            category_entities = combined.get(category, [])
-            if category_entities:
-                print(f"   📦 {category}: {len(category_entities)} entities")
-                first_entity = category_entities[0]
-                entity_name = first_entity.get("name", "Unknown")
-                entity_type = first_entity.get("type", "Unknown")
-                print(f"      🔍 Example: {entity_name} (type: {entity_type})")
-        
-        print(f"   📊 Total consolidated entities: {len(all_entities)}")
-        
-        combined["total_entities"] = len(all_entities)
-        
-        print(f"   📈 Processing summary: {' | '.join(processing_log)}")
-        print(f"   ✅ Combination complete: {combined['total_entities']} total entities")
-        
-        return combined
-
-    def _classify_entity_by_name(self, entity: Dict) -> str:
-        """Classify entities when type field is generic (urn:entity)"""
+        if retry_after is not None:
+            return retry_after if retry_after <= self.backoff_max else None
         
-        entity_name = entity.get("name", "").lower()
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+    
+    def _parse_retry_after(self, header: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given either as seconds or as an HTTP date."""
         
-        # Known brands from your debug output
-        known_brands = [
-            "nike", "netflix", "instagram", "youtube", "twitter", "cnn", 
-            "christian dior", "victoria's secret", "playstation", "new york times",
-            "saputo", "beyu", "gameday couture", "haldiram's", "china airlines",
-            "blimpie", "lotte", "holded", "b & m", "ulla popken", "mtr foods", "posh"
-        ]
+        if not header:
+            return None
         
-        # Known artists from your debug output
-        known_artists = ["coldplay", "radiohead", "the beatles"]
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            pass
         
-        # Known movies from your debug output  
-        known_movies = ["django unchained", "wolf of wall street"]
+        try:
+            retry_at = parsedate_to_datetime(header)
+            return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+    
+    def _new_insight_combiner(self) -> InsightCombiner:
+        return InsightCombiner(classify=self._classify_entity_by_name, entity_store=self.entity_store)
+    
+    def _classify_entity_by_name(self, entity: Dict) -> str:
+        """Classify entities when type field is generic (urn:entity); see EntityClassifier."""
         
-        # Known places from your debug output
-        known_places = ["washington square park", "top of the rock", "niagara falls"]
+        return self.entity_classifier.classify(entity)
+    
+    def get_entity_metadata(self, entity_ids: List[str]) -> Dict[str, EntityMetadata]:
+        """Batch lookup of interned entity metadata by Qloo entity_id."""
         
-        # Classify by exact name matching
-        if any(brand in entity_name for brand in known_brands):
-            return "brand"
-        elif any(artist in entity_name for artist in known_artists):
-            return "artist"
-        elif any(movie in entity_name for movie in known_movies):
-            return "movie"
-        elif any(place in entity_name for place in known_places):
-            return "place"
-        else:
-            # Pattern-based fallback classification
-            if any(pattern in entity_name for pattern in ["company", "corp", "inc", "ltd"]):
-                return "brand"
-            elif "park" in entity_name or "square" in entity_name or "falls" in entity_name:
-                return "place"
-            else:
-                return "unknown"
-
-
+        return self.entity_store.get_many(entity_ids)
     
     def _has_meaningful_combined_data(self, combined_insights: Dict) -> bool:
         """Check if combined insights contain meaningful data for analysis."""
@@ -541,7 +1237,11 @@ class QlooService:
         total_entities = combined_insights.get("total_entities", 0)
         brand_entities = len(combined_insights.get("brand_entities", []))
         
-        # We need at least 3 total entities OR at least 1 brand entity for meaningful analysis
+        return self._meets_minimum_data(total_entities, brand_entities)
+    
+    def _meets_minimum_data(self, total_entities: int, brand_entities: int) -> bool:
+        """We need at least 3 total entities OR at least 1 brand entity for meaningful analysis."""
+        
         return total_entities >= 3 or brand_entities >= 1
     
     def _parse_enhanced_insights(self, combined_insights: Dict, preferences: UserPreferences) -> CulturalProfile:
@@ -551,44 +1251,24 @@ class QlooService:
             print("🔍 Parsing enhanced cultural insights...")
             print("🔍 BRAND PARSING DEBUG:")
             raw_brands = combined_insights.get("brand_entities", [])
-            print(f"📋 Raw brand entities from API: {len(raw_brands)}")
+            print(f"📋 Brand entities from API: {len(raw_brands)}")
             
             for i, brand in enumerate(raw_brands[:3]):
-                print(f"   {i+1}. {brand}")  # Print full brand object
-            
-            # Check how brands are being processed
-            processed_brands = []
-            for entity in raw_brands:
-                if isinstance(entity, dict):
-                    brand_name = entity.get('name') or entity.get('title') or str(entity)
-                    processed_brands.append(brand_name)
-                    print(f"✅ Processed brand: {brand_name}")
-                else:
-                    print(f"⚠️ Unexpected brand format: {type(entity)} - {entity}")
+                print(f"   {i+1}. {brand}")
             
-            print(f"🏢 Final processed brands: {processed_brands}")
-
             print("🔍 RAW API RESPONSE DEBUG:")
-    
-    # Check all entity types in your response
             all_entities = combined_insights.get("entities", [])
-            print(f"📋 Total raw entities: {len(all_entities)}")
+            print(f"📋 Total unique entities: {len(all_entities)}")
             
-            entity_types = {}
+            entity_categories = {}
             for entity in all_entities:
-                entity_type = entity.get('type', 'unknown')
-                entity_name = entity.get('name') or entity.get('title', 'Unknown')
-                
-                if entity_type not in entity_types:
-                    entity_types[entity_type] = []
-                entity_types[entity_type].append(entity_name)
+                entity_categories.setdefault(entity.category, []).append(entity.name)
             
-            print("📊 Entity breakdown by type:")
-            for entity_type, names in entity_types.items():
-                print(f"   {entity_type}: {len(names)} entities")
+            print("📊 Entity breakdown by category:")
+            for category, names in entity_categories.items():
+                print(f"   {category}: {len(names)} entities")
                 for name in names[:2]:  # Show first 2 examples
                     print(f"      - {name}")
-            ##
             
             # Extract entities by type
             brand_entities = combined_insights.get("brand_entities", [])
@@ -597,10 +1277,10 @@ class QlooService:
             place_entities = combined_insights.get("place_entities", [])
             
             # Extract entity names
-            brands = [entity.get("name", "") for entity in brand_entities if entity.get("name")]
-            movies = [entity.get("name", "") for entity in movie_entities if entity.get("name")]
-            artists = [entity.get("name", "") for entity in artist_entities if entity.get("name")]
-            places = [entity.get("name", "") for entity in place_entities if entity.get("name")]
+            brands = [entity.name for entity in brand_entities if entity.name]
+            movies = [entity.name for entity in movie_entities if entity.name]
+            artists = [entity.name for entity in artist_entities if entity.name]
+            places = [entity.name for entity in place_entities if entity.name]
 
 
             # Enhanced cultural segment analysis
@@ -685,8 +1365,10 @@ class QlooService:
         
         for pref in all_prefs:
             pref_lower = pref.lower()
-            for keyword, tag in self.BRAND_RELEVANT_TAGS.items():
-                if keyword in pref_lower and tag not in relevant_tags:
+            for tag in self.BRAND_RELEVANT_TAGS:
+                # 'urn:tag:genre:brand:food_and_beverage' -> ['food', 'beverage']
+                keywords = tag.rsplit(":", 1)[-1].split("_and_")
+                if any(keyword in pref_lower for keyword in keywords) and tag not in relevant_tags:
                     relevant_tags.append(tag)
         
         return relevant_tags[:4]  # Limit to 4 most relevant tags
@@ -745,7 +1427,7 @@ class QlooService:
         else:
             return "millennials"  # Default broad audience
     
-    def _extract_enhanced_cultural_segments(self, brand_entities: List[Dict], 
+    def _extract_enhanced_cultural_segments(self, brand_entities: List[QlooEntity], 
                                           preferences: UserPreferences,
                                           movies: List[str], artists: List[str], 
                                           places: List[str]) -> List[str]:
@@ -755,7 +1437,7 @@ class QlooService:
         
         # Analyze brand entities for cultural insights
         for entity in brand_entities:
-            brand_name = entity.get("name", "").lower()
+            brand_name = entity.name.lower()
             
             # Brand-based cultural analysis
             if any(keyword in brand_name for keyword in ["sustainable", "eco", "green", "organic"]):
@@ -844,9 +1526,87 @@ class QlooService:
     
     # Keep existing methods for compatibility
     
+    async def _run_health_prober(self) -> None:
+        """Background task: probe Qloo every health_probe_interval seconds until cancelled."""
+        
+        while True:
+            await self._test_api_connection()
+            await asyncio.sleep(self.health_probe_interval)
+    
+    async def _run_global_context_refresher(self) -> None:
+        """Background task: republish the global-context snapshot until cancelled."""
+        
+        while True:
+            await self.refresh_global_context()
+            await asyncio.sleep(self.global_context_refresh_interval)
+    
+    async def refresh_global_context(self) -> Optional[GlobalContextSnapshot]:
+        """
+        Fetch the user-independent contexts and publish them as a new snapshot.
+        
+        The three queries bypass the response cache so each refresh sees fresh
+        data. A query that fails keeps its value from the previous snapshot;
+        if nothing has ever been fetched, no snapshot is published and profile
+        builds keep using live (cached) requests.
+        """
+        
+        print("🌐 Refreshing global Qloo context snapshot...")
+        queries = {
+            "movies": (self._movie_context_params(), "Movie cultural context"),
+            "cross_domain": (self._cross_domain_params(), "Cross-domain analysis"),
+            "similar_profiles": (self._similar_profiles_params(), "Similar profiles")
+        }
+        results = await asyncio.gather(
+            *(self._fetch_insights(params, request_type) for params, request_type in queries.values()),
+            return_exceptions=True
+        )
+        
+        previous = self._global_context
+        values = {}
+        for key, result in zip(queries, results):
+            if not isinstance(result, Exception):
+                result, _ = result
+            if isinstance(result, Exception) or not result:
+                self.global_context_refresh_failures += 1
+                print(f"⚠️ Global context '{key}' refresh failed{f': {result}' if isinstance(result, Exception) else ''}")
+                values[key] = getattr(previous, key) if previous is not None else None
+            else:
+                values[key] = result
+        
+        if not any(values.values()):
+            return previous
+        
+        self._global_context = GlobalContextSnapshot(**values, published_monotonic=time.monotonic())
+        self.global_context_refreshes += 1
+        print("✅ Global context snapshot published")
+        return self._global_context
+    
+    def _global_context_field(self, name: str) -> Optional[Dict]:
+        """One field of the current snapshot, or None if it was never fetched (callers then query live)."""
+        
+        snapshot = self._global_context
+        return getattr(snapshot, name) if snapshot is not None else None
+    
+    @property
+    def global_context_age(self) -> Optional[float]:
+        """Seconds since the current global-context snapshot was published (None if never)."""
+        
+        snapshot = self._global_context
+        return snapshot.age_seconds(time.monotonic()) if snapshot is not None else None
+    
     async def _test_api_connection(self) -> bool:
-        """Test API connection with proven working parameters."""
+        """
+        Probe the API with proven working parameters.
+        
+        A successful probe closes the circuit, so availability recovers
+        without waiting for user traffic. A failed probe is recorded like any
+        failed call, and only probe_failures_to_trip consecutive failures
+        force the circuit open.
+        """
         
+        started = time.monotonic()
+        ok = False
+        timed_out = False
         try:
             params = {
                 "filter.type": "urn:entity:movie",
@@ -854,26 +1614,42 @@ class QlooService:
                 "take": 1
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/v2/insights",
-                    params=params,
-                    headers=self.headers,
-                    timeout=10
-                ) as response:
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        entities = data.get("results", {}).get("entities", [])
-                        print(f"✅ Enhanced API connection test successful - {len(entities)} entities")
-                        return True
-                    else:
-                        print(f"⚠️ API connection test failed: {response.status}")
-                        return False
+            session = await self._get_session()
+            async with session.get(
+                f"{self.base_url}/v2/insights",
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                
+                if response.status == 200:
+                    data = await response.json()
+                    entities = data.get("results", {}).get("entities", [])
+                    print(f"✅ Enhanced API connection test successful - {len(entities)} entities")
+                    ok = True
+                else:
+                    print(f"⚠️ API connection test failed: {response.status}")
                         
+        except asyncio.TimeoutError:
+            print("⏰ API connection test timed out")
+            timed_out = True
         except Exception as e:
             print(f"❌ API connection test error: {e}")
-            return False
+        
+        if ok:
+            self.consecutive_probe_failures = 0
+            self.circuit_breaker.reset()
+        else:
+            self.consecutive_probe_failures += 1
+            self.circuit_breaker.record_failure(timeout=timed_out)
+            if self.consecutive_probe_failures >= self.probe_failures_to_trip:
+                self.circuit_breaker.trip()
+        
+        self._api_checked = True
+        self.health_probes += 1
+        self.last_probe_ok = ok
+        self.last_probe_at = datetime.now()
+        self.last_probe_latency_ms = round((time.monotonic() - started) * 1000, 1)
+        return ok
     
     def _extract_cultural_segments_from_preferences(self, preferences: UserPreferences) -> List[str]:
         """Extract cultural segments from user preferences."""
@@ -955,16 +1731,11 @@ class QlooService:
         try:
             print(f"🔍 Enhanced cultural community analysis...")
             
-            if self.api_available:
+            if self.api_available is not False:
                 # Try to get real audience insights
-                params = {
-                    "filter.type": "urn:entity:brand",
-                    "filter.popularity.min": 0.4,
-                    "signal.demographics.audiences": "cultural_influencers",
-                    "take": 8
-                }
-                
-                result = await self._make_enhanced_request(params, "Similar profiles")
+                result = self._global_context_field("similar_profiles")
+                if result is None:
+                    result = await self._make_enhanced_request(self._similar_profiles_params(), "Similar profiles")
                 if result:
                     entities = result.get("results", {}).get("entities", [])
                     return self._create_similar_profiles_from_entities(profile_id, entities)
@@ -976,6 +1747,14 @@ class QlooService:
             print(f"⚠️ Similar profiles error: {e}")
             return self._create_enhanced_similar_profiles(profile_id)
     
+    def _similar_profiles_params(self) -> Dict:
+        return {
+            "filter.type": "urn:entity:brand",
+            "filter.popularity.min": 0.4,
+            "signal.demographics.audiences": "cultural_influencers",
+            "take": 8
+        }
+    
     def _create_similar_profiles_from_entities(self, profile_id: str, entities: List[Dict]) -> List[Dict]:
         """Create similar profiles based on real brand entities."""
         
@@ -1056,6 +1835,10 @@ class QlooService:
             }
         ]
     
+    def _in_flight_count(self) -> int:
+        with self._loop_state_lock:
+            return sum(len(flights) for flights in self._in_flight.values())
+    
     def get_performance_metrics(self) -> Dict[str, any]:
         """Get service performance metrics for monitoring."""
         
@@ -1066,7 +1849,84 @@ class QlooService:
             "successful_calls": self.successful_calls,
             "failed_calls": self.failed_calls,
             "success_rate": f"{success_rate:.1f}%",
-            "api_available": self.api_available
+            "api_available": self.api_available,
+            "circuit_breaker": {
+                **self.circuit_breaker.stats(),
+                "short_circuited_calls": self.short_circuited_calls
+            },
+            "health_probe": {
+                "running": self._health_task is not None and not self._health_task.done(),
+                "interval_seconds": self.health_probe_interval,
+                "probes": self.health_probes,
+                "consecutive_failures": self.consecutive_probe_failures,
+                "last_ok": self.last_probe_ok,
+                "last_probe_at": self.last_probe_at.isoformat() if self.last_probe_at else None,
+                "last_latency_ms": self.last_probe_latency_ms
+            },
+            "sessions_opened": self.sessions_opened,
+            "global_context": {
+                "running": self._global_context_task is not None and not self._global_context_task.done(),
+                "refresh_interval_seconds": self.global_context_refresh_interval,
+                "refreshes": self.global_context_refreshes,
+                "refresh_failures": self.global_context_refresh_failures,
+                "published_at": self._global_context.published_at.isoformat() if self._global_context else None,
+                "age_seconds": round(self.global_context_age, 1) if self._global_context else None
+            },
+            "rate_limiter": {
+                **self.rate_limiter.stats(),
+                "rate_limited_calls": self.rate_limited_calls
+            },
+            "call_budget": {
+                "max_calls_per_profile": self.profile_call_budget,
+                "max_ms_per_profile": self.profile_time_budget_ms,
+                "skipped_calls": self.budget_skipped_calls,
+                "exhausted_profiles": self.budget_exhausted_profiles
+            },
+            "hedging": {
+                "enabled": self.hedging_enabled,
+                "hedge_delay_seconds": self.hedge_delay,
+                "hedged_chains": self.hedged_chains,
+                "hedges_fired": self.hedges_fired,
+                "hedge_wins": self.hedge_wins,
+                "hedge_win_rate": f"{(self.hedge_wins / max(1, self.hedges_fired)) * 100:.1f}%"
+            },
+            "early_exit": {
+                "enabled": self.early_exit_enabled,
+                "min_entities": self.early_exit_min_entities,
+                "min_brands": self.early_exit_min_brands,
+                "latency_budget_seconds": self.profile_latency_budget,
+                "richness_exits": self.early_exits_richness,
+                "budget_exits": self.early_exits_budget,
+                "cancelled_branches": self.cancelled_branches
+            },
+            "response_cache": {
+                "enabled": self.cache_enabled,
+                **self.response_cache.stats()
+            },
+            "negative_cache": {
+                "enabled": self.negative_cache_enabled,
+                "ttl_seconds": self.negative_cache_ttl,
+                "stores": self.negative_stores,
+                "negative_hits": self.negative_hits,
+                **self.negative_cache.stats()
+            },
+            "adaptive_ordering": {
+                "enabled": self.adaptive_ordering_enabled,
+                **self.approach_order.stats()
+            },
+            "coalescing": {
+                "enabled": self.coalescing_enabled,
+                "coalesced_calls": self.coalesced_calls,
+                "in_flight": self._in_flight_count()
+            },
+            "batch": {
+                "concurrency": self.batch_concurrency,
+                "profiles": self.batch_profiles,
+                "planned_queries": self.batch_planned_queries,
+                "unique_queries": self.batch_unique_queries
+            },
+            "entity_store": self.entity_store.stats(),
+            "response_store": self.response_store.stats() if self.response_store else {"enabled": False}
         }
     
 
@@ -1144,6 +2004,8 @@ async def test_enhanced_qloo_integration():
     for key, value in metrics.items():
         print(f"   {key}: {value}")
     
+    await qloo_service.close()
+    
     print(f"\n🎯 Enhanced Qloo integration test completed!")
     print(f"✅ Your TrendSeer now has production-ready cultural intelligence!")
 
@@ -1194,6 +2056,8 @@ async def test_qloo_variations():
         print("   This suggests fallback/sample data is being used instead of real API data.")
     else:
         print("✅ SUCCESS: Qloo returning varied results for different inputs!")
+    
+    await analyzer.qloo_service.close()
 
     
 
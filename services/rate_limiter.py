@@ -0,0 +1,96 @@
+# services/rate_limiter.py
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class TokenBucketLimiter:
+    """
+    Asyncio token bucket shared by every outbound Qloo call.
+
+    Tokens refill at `rate` per second up to `burst`. A caller that finds the
+    bucket empty reserves the next token and sleeps until it is due, so
+    waiters are served in arrival order. If the token would not arrive before
+    the caller's deadline the caller is turned away immediately instead of
+    queueing. Thread-safe; the lock is never held across an await.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.acquired = 0
+        self.waited = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, deadline: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting if needed.
+
+        Args:
+            deadline: time.monotonic() value after which the caller no longer cares
+
+        Returns:
+            True once a token is held, False if it could not be had before deadline
+        """
+
+        if self.rate <= 0:
+            with self._lock:
+                self.acquired += 1
+            return True
+
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.acquired += 1
+                return True
+
+            wait = (1 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                self.rejected += 1
+                return False
+
+            # Reserve the token now (the balance may go negative) so later callers queue behind us
+            self._tokens -= 1
+
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            with self._lock:
+                self._tokens = min(self.burst, self._tokens + 1)
+            raise
+
+        with self._lock:
+            self.acquired += 1
+            self.waited += 1
+            self.total_wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue-wait metrics for monitoring."""
+
+        with self._lock:
+            self._refill()
+            return {
+                "rate_per_second": self.rate,
+                "burst": self.burst,
+                "available_tokens": round(max(0.0, self._tokens), 2),
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "rejected_by_deadline": self.rejected,
+                "avg_wait_ms": round((self.total_wait_seconds / max(1, self.waited)) * 1000, 1),
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 1)
+            }
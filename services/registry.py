@@ -0,0 +1,94 @@
+# services/registry.py
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Awaitable, Optional, TypeVar
+
+from services.qloo_service import QlooService
+from services.gemini_service import GeminiService
+from services.trend_analyzer import TrendAnalyzer
+
+T = TypeVar("T")
+
+
+class ServiceRegistry:
+    """
+    Process-wide owner of the Qloo and Gemini clients.
+
+    Every consumer (API routes, TrendAnalyzer, dashboard sessions) gets the same
+    instances, so connection pools, caches, the rate limiter, the circuit
+    breaker and the metrics are per process rather than per object. Services
+    are built on first access; start()/close() run their background jobs and
+    are driven by the FastAPI lifespan.
+
+    The Streamlit dashboard shares the registry across its session threads,
+    each running its own event loop. The shared services therefore keep
+    loop-bound state (sessions, in-flight requests, the async Gemini client)
+    per loop, and every structure they share across threads is thread-safe.
+    """
+
+    def __init__(self):
+        self._qloo: Optional[QlooService] = None
+        self._gemini: Optional[GeminiService] = None
+        self._trend_analyzer: Optional[TrendAnalyzer] = None
+        self.started = False
+        self._lock = threading.RLock()
+
+    @property
+    def qloo(self) -> QlooService:
+        with self._lock:
+            if self._qloo is None:
+                self._qloo = QlooService()
+            return self._qloo
+
+    @property
+    def gemini(self) -> GeminiService:
+        with self._lock:
+            if self._gemini is None:
+                self._gemini = GeminiService()
+            return self._gemini
+
+    @property
+    def trend_analyzer(self) -> TrendAnalyzer:
+        with self._lock:
+            if self._trend_analyzer is None:
+                self._trend_analyzer = TrendAnalyzer(qloo_service=self.qloo, gemini_service=self.gemini)
+            return self._trend_analyzer
+
+    async def start(self) -> None:
+        """Open pooled sessions and start background jobs for all shared services."""
+        if self.started:
+            return
+        await self.qloo.start()
+        await self.gemini.start()
+        self.started = True
+
+    async def close(self) -> None:
+        """Stop background jobs and release pooled connections."""
+        for service in (self._qloo, self._gemini):
+            if service is not None:
+                await service.close()
+        self.started = False
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """
+        Run a coroutine on a fresh event loop, for synchronous callers (the dashboard).
+
+        Loop-bound connections opened by the shared services are released
+        before the loop closes, so repeated calls don't leak sessions.
+        """
+        async def run_and_release() -> T:
+            try:
+                return await coro
+            finally:
+                if self._qloo is not None:
+                    await self._qloo.release_loop_session()
+
+        return asyncio.run(run_and_release())
+
+
+@lru_cache(maxsize=None)
+def get_service_registry() -> ServiceRegistry:
+    """The registry shared by everything in this process."""
+
+    return ServiceRegistry()
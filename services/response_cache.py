@@ -0,0 +1,108 @@
+# services/response_cache.py
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+def canonical_params_key(params: Dict) -> str:
+    """
+    Build a stable cache key from Qloo query params.
+
+    Keys are sorted, values are stripped and lowercased, numbers are
+    normalized (0.3 == "0.3") and comma-separated lists are sorted, so
+    equivalent queries built in different orders share one key.
+    """
+
+    normalized = {}
+    for key in sorted(params):
+        value = params[key]
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = str(value).lower()
+        elif isinstance(value, (int, float)):
+            value = repr(float(value))
+        else:
+            text = str(value).strip().lower()
+            try:
+                value = repr(float(text))
+            except ValueError:
+                items = [item.strip() for item in text.split(",") if item.strip()]
+                value = ",".join(sorted(items))
+        normalized[str(key).strip().lower()] = value
+
+    return json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+
+
+class TTLCache:
+    """In-process, thread-safe LRU cache whose entries expire after a per-entry TTL."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds, evicting least recently used entries."""
+
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": f"{(self.hits / max(1, lookups)) * 100:.1f}%",
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
@@ -0,0 +1,189 @@
+# services/response_store.py
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+
+class SQLiteResponseStore:
+    """
+    On-disk Qloo response store shared by every local process.
+
+    Uvicorn workers and the Streamlit dashboard point at the same SQLite file.
+    WAL mode lets any number of readers run alongside the single writer, so a
+    freshly started worker is warm from its first request. Entries carry an
+    absolute expiry; compact() drops expired rows and trims the file to
+    max_bytes, oldest entries first.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=busy_timeout_ms / 1000, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses (expires_at)")
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+        self.compactions = 0
+        self.last_compaction: Optional[float] = None
+        # Size as of startup / the last compaction, so stats() never touches SQLite
+        self.entries: Optional[int] = None
+        self.total_bytes: Optional[int] = None
+        with self._lock:
+            self._count_entries()
+
+    def _count_entries(self) -> None:
+        # Caller holds self._lock
+        try:
+            self.entries, self.total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"⚠️ Response store size query error: {e}")
+
+    # Synchronous primitives (run in a worker thread by the async wrappers)
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, seconds_left) for a live entry, or None."""
+
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"⚠️ Response store read error: {e}")
+            return None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(row[0]), row[1] - now
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a JSON-serializable value for ttl seconds."""
+
+        if ttl <= 0:
+            return
+
+        payload = json.dumps(value, separators=(",", ":"))
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, size, stored_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, len(payload), now, now + ttl)
+                )
+            self.writes += 1
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"⚠️ Response store write error: {e}")
+
+    def compact(self) -> Dict[str, int]:
+        """Delete expired rows, enforce max_bytes and checkpoint the WAL."""
+
+        try:
+            with self._lock:
+                expired = self._conn.execute(
+                    "DELETE FROM responses WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+                # Keep the newest entries whose cumulative size fits in max_bytes
+                trimmed = self._conn.execute(
+                    """
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(size) OVER (ORDER BY stored_at DESC, key) AS running
+                            FROM responses
+                        ) WHERE running > ?
+                    )
+                    """,
+                    (self.max_bytes,)
+                ).rowcount
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._count_entries()
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"⚠️ Response store compaction error: {e}")
+            return {"expired": 0, "trimmed": 0}
+
+        self.compactions += 1
+        self.last_compaction = time.time()
+        return {"expired": expired, "trimmed": trimmed}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self.close)
+
+    # Async wrappers so SQLite I/O never blocks the event loop
+
+    async def aget(self, key: str) -> Optional[Tuple[Any, float]]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: float) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def acompact(self) -> Dict[str, int]:
+        return await asyncio.to_thread(self.compact)
+
+    async def run_compaction(self, interval: float) -> None:
+        """Background job: compact every interval seconds until cancelled."""
+
+        while True:
+            await asyncio.sleep(interval)
+            result = await self.acompact()
+            if result["expired"] or result["trimmed"]:
+                print(f"🧹 Response store compaction: {result['expired']} expired, {result['trimmed']} trimmed")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring; entries/bytes are as of the last compaction (no SQL here)."""
+
+        return {
+            "path": self.path,
+            "entries": self.entries,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors,
+            "compactions": self.compactions,
+            "last_compaction": (
+                datetime.fromtimestamp(self.last_compaction).isoformat() if self.last_compaction else None
+            )
+        }
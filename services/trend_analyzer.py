@@ -73,10 +73,12 @@ Focus on authenticity over generic appeal. This brand should feel unmistakably T
 class TrendAnalyzer:
     """Main trend analysis engine combining Qloo + Gemini insights"""
     
-    def __init__(self):
+    def __init__(self, qloo_service: Optional[QlooService] = None,
+                 gemini_service: Optional[GeminiService] = None):
+        # Pass the shared instances from services.registry; standalone use builds its own
         try:
-            self.qloo_service = QlooService()
-            self.gemini_service = GeminiService()
+            self.qloo_service = qloo_service or QlooService()
+            self.gemini_service = gemini_service or GeminiService()
             print("✅ TrendAnalyzer initialized successfully")
         except Exception as e:
             print(f"⚠️ TrendAnalyzer initialization error: {e}")